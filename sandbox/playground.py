@@ -25,9 +25,9 @@ import inspect
 import json
 import os
 import pdb
-import re
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Sequence, cast
 
 import docker
@@ -47,10 +47,16 @@ ROOT_DIR = os.path.join(os.path.dirname(CUR_PATH), "..")
 def kill_oef():
     """Kill any running OEF instance."""
     client = docker.from_env()
-    for container in client.containers.list():
-        if any(re.match("fetchai/oef-search", tag) for tag in container.image.tags):
-            print("Stopping existing OEF Node...")
-            container.stop()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = []
+        for container in client.containers.list():
+            if any(
+                tag.startswith("fetchai/oef-search") for tag in container.image.tags
+            ):
+                print("Stopping existing OEF Node...")
+                futures.append(executor.submit(container.stop))
+        for future in futures:
+            future.result()
 
 
 def launch_oef():
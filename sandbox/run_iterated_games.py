@@ -30,14 +30,14 @@ import logging
 import os
 import pprint
 import random
-import re
 import shutil
 import subprocess
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 
-from tac.platform.game.stats import GameStats
+from tac.platform.game.stats import GameStats, load_game_data
 
 OUR_DIRECTORY = os.path.dirname(inspect.getfile(inspect.currentframe()))  # type: ignore
 ROOT_DIR = os.path.join(OUR_DIRECTORY, "..")
@@ -166,10 +166,16 @@ def wait_at_least_n_minutes(n: int):
 def _stop_oef_search_images():
     """Stop any running OEF nodes."""
     client = docker.from_env()
-    for container in client.containers.list():
-        if any(re.match("fetchai/oef-search", tag) for tag in container.image.tags):
-            print("Stopping existing OEF Node...")
-            container.stop()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = []
+        for container in client.containers.list():
+            if any(
+                tag.startswith("fetchai/oef-search") for tag in container.image.tags
+            ):
+                print("Stopping existing OEF Node...")
+                futures.append(executor.submit(container.stop))
+        for future in futures:
+            future.result()
 
 
 def shutdown_running_oef_or_visdom_servers():
@@ -230,8 +236,8 @@ def collect_data(datadir: str, experiment_names: List[str]) -> List[GameStats]:
     """
     result = []
     for experiment_name in experiment_names:
-        json_experiment_data = json.load(
-            open(os.path.join(datadir, experiment_name, "game.json"))
+        json_experiment_data = load_game_data(
+            os.path.join(datadir, experiment_name, "game.json")
         )
         game_stats = GameStats.from_json(json_experiment_data)
         result.append(game_stats)
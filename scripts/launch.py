@@ -23,13 +23,15 @@
 
 import inspect
 import os
-import re
+import socket
 import subprocess
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import docker
 
 from tac.agents.participant.v1.examples.baseline import main as participant_agent_main
+from tac.platform.oef_health_check import OEFHealthCheck
 from tac.platform.shared_sim_status import register_shared_dir, get_shared_dir
 
 CUR_PATH = inspect.getfile(inspect.currentframe())  # type: ignore
@@ -39,28 +41,39 @@ ROOT_DIR = os.path.join(os.path.dirname(CUR_PATH), "..")
 class Sandbox:
     """Class to manage the sandbox."""
 
-    def _build_sandbox(self):
-        """Build sandbox."""
-        sandbox_build_process = None  # type: Optional[subprocess.Popen]
+    def _build_sandbox(self) -> subprocess.Popen:
+        """
+        Start building the sandbox.
+
+        :return: the build process, which the caller must wait for.
+        """
         sandbox_build_process = subprocess.Popen(
             ["docker-compose", "build"],
             env=os.environ,
             cwd=os.path.join(ROOT_DIR, "sandbox"),
         )
-        sandbox_build_process.wait()
+        return sandbox_build_process
 
     def _stop_oef_search_images(self):
         """Stop any running OEF nodes."""
         client = docker.from_env()
-        for container in client.containers.list():
-            if any(re.match("fetchai/oef-search", tag) for tag in container.image.tags):
-                print("Stopping existing OEF Node...")
-                container.stop()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = []
+            for container in client.containers.list():
+                if any(
+                    tag.startswith("fetchai/oef-search") for tag in container.image.tags
+                ):
+                    print("Stopping existing OEF Node...")
+                    futures.append(executor.submit(container.stop))
+            for future in futures:
+                future.result()
 
     def __enter__(self):
         """Define what the context manager should do at the beginning of the block."""
+        # the build does not depend on the old OEF nodes, so stop them while it runs.
+        sandbox_build_process = self._build_sandbox()
         self._stop_oef_search_images()
-        self._build_sandbox()
+        sandbox_build_process.wait()
 
         register_shared_dir(
             os.path.join(os.path.dirname(os.path.abspath(__file__)), "../data/shared")
@@ -80,16 +93,34 @@ class Sandbox:
         self.sandbox_process.terminate()
 
 
-def wait_for_oef():
-    """Wait for the OEF to come live."""
-    print("Waiting for the OEF to be operative...")
-    wait_for_oef = subprocess.Popen(
-        [os.path.join("sandbox", "wait-for-oef.sh"), "127.0.0.1", "10000", ":"],
-        env=os.environ,
-        cwd=ROOT_DIR,
-    )
+def wait_for_oef(
+    oef_addr: str = "127.0.0.1", oef_port: int = 10000, timeout: float = 60.0
+) -> None:
+    """
+    Wait for the OEF to come live.
+
+    The OEF port is first probed with a plain TCP connection, which is cheap to retry.
+    Only once the port accepts connections the (more expensive) OEF health check is run.
 
-    wait_for_oef.wait(60)
+    :param oef_addr: the TCP/IP address of the OEF node.
+    :param oef_port: the TCP/IP port of the OEF node.
+    :param timeout: the maximum time in seconds to wait.
+    :return: None
+    :raises TimeoutError: if the OEF is not operative before the timeout expires.
+    """
+    print("Waiting for the OEF to be operative...")
+    deadline = time.monotonic() + timeout
+    backoff = 0.1
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((oef_addr, oef_port), timeout=0.5).close()
+            if OEFHealthCheck(oef_addr, oef_port).run():
+                return
+        except OSError:
+            pass
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 1.0)
+    raise TimeoutError("The OEF is not operative after {} seconds.".format(timeout))
 
 
 if __name__ == "__main__":
@@ -24,10 +24,10 @@ import importlib
 import inspect
 import os
 import platform
-import re
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import docker
 
@@ -67,10 +67,16 @@ class OEFNode:
     def _stop_oef_search_images(self):
         """Stop any running OEF nodes."""
         client = docker.from_env()
-        for container in client.containers.list():
-            if any(re.match("fetchai/oef-search", tag) for tag in container.image.tags):
-                print("Stopping existing OEF Node...")
-                container.stop()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = []
+            for container in client.containers.list():
+                if any(
+                    tag.startswith("fetchai/oef-search") for tag in container.image.tags
+                ):
+                    print("Stopping existing OEF Node...")
+                    futures.append(executor.submit(container.stop))
+            for future in futures:
+                future.result()
 
     def _wait_for_oef(self):
         """Wait for the OEF to come live."""
@@ -40,7 +40,12 @@ with open("README.md", "r", encoding="utf-8") as f:
     readme = f.read()
 
 
-extras = {"gui": ["flask", "flask_restful", "wtforms"]}
+extras = {
+    "gui": ["flask", "flask_restful", "wtforms"],
+    "uvloop": ["uvloop"],
+    "orjson": ["orjson"],
+    "numba": ["numba"],
+}
 
 setup(
     name=about["__title__"],
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the base class of the TAC agents."""
+
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC
+from queue import Queue
+from typing import Optional
+
+from aea.agent import Agent, AgentState, Liveness
+from aea.mail.base import InBox
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# the period in (fractions of) seconds at which the inbox is polled, when it cannot be waited on.
+INBOX_POLL_PERIOD = 0.01
+
+
+def _get_inbox_queue(inbox: InBox) -> Optional[Queue]:
+    """
+    Get the queue behind an inbox, to wait on it.
+
+    The InBox of aea 0.1.4 wraps a queue.Queue in its private _queue attribute, and has no public way
+    to wait for a message without consuming it. If a later version changes that, None is returned
+    and the inbox is polled instead.
+
+    :param inbox: the inbox.
+    :return: the queue of the inbox, or None if it cannot be waited on.
+    """
+    queue = getattr(inbox, "_queue", None)
+    if (
+        isinstance(queue, Queue)
+        and hasattr(queue, "not_empty")
+        and hasattr(queue, "_qsize")
+    ):
+        return queue
+    return None
+
+
+class TACLiveness(Liveness):
+    """Determines the liveness of the agent, using an event shared between threads."""
+
+    def __init__(self):
+        """Instantiate the liveness."""
+        self._stopped = threading.Event()
+        super().__init__()
+
+    @property
+    def _is_stopped(self) -> bool:
+        """Check whether the liveness is stopped."""
+        return self._stopped.is_set()
+
+    @_is_stopped.setter
+    def _is_stopped(self, is_stopped: bool) -> None:
+        """Set or clear the stopped flag."""
+        if is_stopped:
+            self._stopped.set()
+        else:
+            self._stopped.clear()
+
+    @property
+    def is_stopped(self) -> bool:
+        """Check whether the liveness is stopped."""
+        return self._stopped.is_set()
+
+
+class TACAgent(Agent, ABC):
+    """
+    The TACAgent class extends the AEA agent with an event-driven main loop.
+
+    Instead of sleeping for the whole timeout between act and react, the main loop
+    blocks on the inbox and wakes up as soon as a message arrives. The timeout is
+    only used as the cadence for act and update. Stopping the agent from another thread
+    wakes up the main loop as well.
+
+    When no message arrives for a whole cycle, the cadence is doubled at every idle cycle,
+    up to the maximum timeout. It falls back to the timeout as soon as a message arrives.
+
+    If uvloop is installed, it is used as the event loop of the OEF networking core.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        private_key_pem_path: Optional[str] = None,
+        timeout: float = 1.0,
+        debug: bool = False,
+        max_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Instantiate the agent.
+
+        :param name: the name of the agent
+        :param private_key_pem_path: the path to the private key of the agent.
+        :param timeout: the time in (fractions of) seconds to time out an agent between act and react
+        :param debug: if True, run the agent in debug mode.
+        :param max_timeout: the maximum time in (fractions of) seconds between act and react when the agent is idle.
+                            Defaults to four times the timeout.
+
+        :return: None
+        """
+        super().__init__(name, private_key_pem_path, timeout, debug)
+        self._max_timeout = max_timeout if max_timeout is not None else 4 * timeout
+        self._liveness = TACLiveness()
+        self._agent_state = AgentState.INITIATED
+
+    @property
+    def agent_state(self) -> AgentState:
+        """
+        Get the state of the agent.
+
+        The state is updated when the agent starts and stops, instead of being computed on every access.
+
+        :return the agent state.
+        """
+        return self._agent_state
+
+    @property
+    def agent_state_computed(self) -> AgentState:
+        """
+        Compute the state of the agent from its mailbox and liveness.
+
+        :return the agent state.
+        :raises ValueError: if the state does not satisfy any of the foreseen conditions.
+        """
+        return super().agent_state
+
+    def start(self) -> None:
+        """
+        Start the agent.
+
+        :return: None
+        """
+        if uvloop is not None and not isinstance(
+            asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy
+        ):
+            logger.debug("[{}]: Using uvloop as event loop...".format(self.name))
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        super().start()
+
+    def _run_main_loop(self) -> None:
+        """
+        Run the main loop of the agent.
+
+        :return: None
+        """
+        logger.debug("[{}]: Start processing messages...".format(self.name))
+        self._agent_state = self.agent_state_computed
+        cycle_timeout = self._timeout
+        is_idle = False
+        next_cycle = time.monotonic()
+        while not self.liveness.is_stopped:
+            is_cycle_due = time.monotonic() >= next_cycle
+            if is_cycle_due:
+                if is_idle:
+                    cycle_timeout = min(cycle_timeout * 2, self._max_timeout)
+                else:
+                    cycle_timeout = self._timeout
+                is_idle = True
+                next_cycle = time.monotonic() + cycle_timeout
+                self.act()
+            if self._wait_for_inbox(next_cycle - time.monotonic()):
+                is_idle = False
+                next_cycle = min(next_cycle, time.monotonic() + self._timeout)
+            if self.liveness.is_stopped:
+                break
+            self.react()
+            if is_cycle_due:
+                self.update()
+        logger.debug("[{}]: Exiting main loop...".format(self.name))
+
+    def stop(self) -> None:
+        """
+        Stop the agent.
+
+        :return: None
+        """
+        self.liveness._is_stopped = True
+        self._wake_up()
+        super().stop()
+        self._agent_state = self.agent_state_computed
+
+    def _wait_for_inbox(self, timeout: float) -> bool:
+        """
+        Block until a message is in the inbox, or until the timeout expires.
+
+        :param timeout: the maximum time in (fractions of) seconds to wait.
+        :return: True if the inbox is not empty, False otherwise.
+        """
+        queue = _get_inbox_queue(self.inbox)
+        if queue is None:
+            deadline = time.monotonic() + timeout
+            while self.inbox.empty() and not self.liveness.is_stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, INBOX_POLL_PERIOD))
+            return not self.inbox.empty()
+
+        with queue.not_empty:
+            if not queue._qsize() and timeout > 0 and not self.liveness.is_stopped:
+                queue.not_empty.wait(timeout)
+            return bool(queue._qsize())
+
+    def _wake_up(self) -> None:
+        """
+        Wake up the main loop if it is waiting for the inbox.
+
+        :return: None
+        """
+        if self.mailbox is None:
+            return
+        queue = _get_inbox_queue(self.inbox)
+        # a polling main loop checks the liveness at every poll, so it needs no wake up.
+        if queue is None:
+            return
+        with queue.not_empty:
+            queue.not_empty.notify_all()
@@ -30,10 +30,10 @@ import time
 from typing import Optional
 
 
-from aea.agent import Agent
 from aea.channels.oef.connection import OEFMailBox
 from aea.mail.base import Envelope
 
+from tac.agents.base import TACAgent
 from tac.agents.controller.base.handlers import (
     OEFHandler,
     GameHandler,
@@ -50,7 +50,7 @@ else:
     logger = logging.getLogger("tac.platform.controller")
 
 
-class ControllerAgent(Agent):
+class ControllerAgent(TACAgent):
     """The controller agent class implements a controller for TAC."""
 
     def __init__(
@@ -60,7 +60,7 @@ class ControllerAgent(Agent):
         oef_port: int,
         tac_parameters: TACParameters,
         monitor: Monitor,
-        agent_timeout: Optional[float] = 1.0,
+        agent_timeout: float = 1.0,
         max_reactions: int = 100,
         private_key_pem: Optional[str] = None,
         debug: bool = False,
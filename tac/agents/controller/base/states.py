@@ -23,21 +23,26 @@
 Classes:
 
 - GameInitialization: a class to hold the initialization of a game. Immutable.
+- AgentStateView: a view on the state of an agent, backed by the arrays of a game.
+- GoodStateView: a view on the state of a good, backed by the prices of a game.
 - Game: the class that manages an instance of a game (e.g. validate and settling transactions).
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
+
+import numpy as np
 
 from aea.mail.base import Address
 from tac.agents.participant.v1.base.states import AgentState
-from tac.platform.game.base import GameConfiguration, GoodState, Transaction
+from tac.platform.game.base import GameConfiguration, Transaction
 from tac.platform.game.helpers import (
     generate_money_endowments,
     generate_good_endowments,
     generate_utility_params,
     generate_equilibrium_prices_and_holdings,
     determine_scaling_factor,
+    logarithmic_utilities,
 )
 
 
@@ -47,6 +52,7 @@ UtilityParams = List[float]  # an element u_j is the utility value of good j.
 logger = logging.getLogger(__name__)
 
 DEFAULT_PRICE = 0.0
+REPLAY_BATCH_SIZE = 1024
 
 
 class GameInitialization:
@@ -123,16 +129,6 @@ class GameInitialization:
         :return: None
         :raises: AssertionError: if some constraint is not satisfied.
         """
-        assert all(
-            money >= 0 for money in self.initial_money_amounts
-        ), "Money must be non-negative."
-        assert all(
-            e > 0 for row in self.endowments for e in row
-        ), "Endowments must be strictly positive."
-        assert all(
-            e > 0 for row in self.utility_params for e in row
-        ), "UtilityParams must be strictly positive."
-
         assert len(self.endowments) == len(
             self.initial_money_amounts
         ), "Length of endowments and initial_money_amounts must be the same."
@@ -152,6 +148,17 @@ class GameInitialization:
             for row_e, row_u in zip(self.endowments, self.utility_params)
         ), "Dimensions for utility_params and endowments rows must be the same."
 
+        # check the signs with one vectorized comparison per field.
+        assert (
+            np.asarray(self.initial_money_amounts) >= 0
+        ).all(), "Money must be non-negative."
+        assert (
+            np.asarray(self.endowments) > 0
+        ).all(), "Endowments must be strictly positive."
+        assert (
+            np.asarray(self.utility_params) > 0
+        ).all(), "UtilityParams must be strictly positive."
+
     def to_dict(self) -> Dict[str, Any]:
         """Get a dictionary from the object."""
         return {
@@ -189,6 +196,113 @@ class GameInitialization:
         )
 
 
+class AgentStateView:
+    """
+    Represent the state of an agent during the game, as a view on the arrays of the game.
+
+    The state of all the agents is stored in the game as a structure of arrays:
+    a vector of balances and two matrices of shape (nb_agents, nb_goods) for the holdings and
+    the utility params. A view only holds the row of its agent, and reads and writes through it.
+    """
+
+    __slots__ = ("_balances", "_holdings", "_utility_params", "_idx")
+
+    def __init__(
+        self,
+        balances: np.ndarray,
+        holdings: np.ndarray,
+        utility_params: np.ndarray,
+        idx: int,
+    ) -> None:
+        """
+        Instantiate an agent state view.
+
+        :param balances: the balances of all the agents.
+        :param holdings: the holdings of all the agents.
+        :param utility_params: the utility params of all the agents.
+        :param idx: the index of the agent.
+        """
+        self._balances = balances
+        self._holdings = holdings
+        self._utility_params = utility_params
+        self._idx = idx
+
+    @property
+    def balance(self) -> float:
+        """Get the balance of the agent."""
+        return float(self._balances[self._idx])
+
+    @balance.setter
+    def balance(self, balance: float) -> None:
+        """Set the balance of the agent."""
+        self._balances[self._idx] = balance
+
+    @property
+    def current_holdings(self) -> List[int]:
+        """Get current holding of each good."""
+        return self._holdings[self._idx].tolist()
+
+    @property
+    def utility_params(self) -> List[float]:
+        """Get utility parameter for each good."""
+        return self._utility_params[self._idx].tolist()
+
+    def get_score(self) -> float:
+        """
+        Compute the score of the current state.
+
+        :return: the score.
+        """
+        rows = slice(self._idx, self._idx + 1)
+        goods_score = logarithmic_utilities(
+            self._utility_params[rows], self._holdings[rows]
+        )[0]
+        return float(goods_score + self._balances[self._idx])
+
+    def __eq__(self, other) -> bool:
+        """Compare equality with another agent state."""
+        if self is other or (
+            isinstance(other, AgentStateView)
+            and self._balances is other._balances
+            and self._idx == other._idx
+        ):
+            # the same agent of the same game.
+            return True
+        return (
+            isinstance(other, (AgentStateView, AgentState))
+            and self.balance == other.balance
+            and self.utility_params == list(other.utility_params)
+            and self.current_holdings == list(other.current_holdings)
+        )
+
+
+class GoodStateView:
+    """Represent the state of a good during the game, as a view on the prices of the game."""
+
+    __slots__ = ("_prices", "_idx")
+
+    def __init__(self, prices: np.ndarray, idx: int) -> None:
+        """
+        Instantiate a good state view.
+
+        :param prices: the prices of all the goods.
+        :param idx: the index of the good.
+        """
+        self._prices = prices
+        self._idx = idx
+
+    @property
+    def price(self) -> float:
+        """Get the price of the good."""
+        return float(self._prices[self._idx])
+
+    @price.setter
+    def price(self, price: float) -> None:
+        """Set the price of the good."""
+        assert price >= 0, "The price must be non-negative."
+        self._prices[self._idx] = price
+
+
 class Game:
     """
     Class representing a game instance of TAC.
@@ -250,37 +364,29 @@ class Game:
         self._initialization = initialization  # type: GameInitialization
         self.transactions = []  # type: List[Transaction]
 
-        self._initial_agent_states = dict(
-            (
-                agent_pbk,
-                AgentState(
-                    initialization.initial_money_amounts[i],
-                    initialization.endowments[i],
-                    initialization.utility_params[i],
-                ),
-            )
-            for agent_pbk, i in zip(
-                configuration.agent_pbks, range(configuration.nb_agents)
-            )
-        )  # type: Dict[str, AgentState]
+        self._agent_pbk_to_idx = dict(
+            (agent_pbk, i) for i, agent_pbk in enumerate(configuration.agent_pbks)
+        )  # type: Dict[str, int]
+        self._balances = np.array(
+            initialization.initial_money_amounts, dtype=np.float64
+        )
+        self._holdings = np.array(initialization.endowments, dtype=np.int32)
+        self._utility_params = np.array(initialization.utility_params, dtype=np.float64)
+        self._initial_balances = self._balances.copy()
+        self._initial_holdings = self._holdings.copy()
+
+        self._initial_agent_states = {}  # type: Dict[str, AgentStateView]
 
         self.agent_states = dict(
             (
                 agent_pbk,
-                AgentState(
-                    initialization.initial_money_amounts[i],
-                    initialization.endowments[i],
-                    initialization.utility_params[i],
-                ),
-            )
-            for agent_pbk, i in zip(
-                configuration.agent_pbks, range(configuration.nb_agents)
+                AgentStateView(self._balances, self._holdings, self._utility_params, i),
             )
-        )  # type: Dict[str, AgentState]
+            for i, agent_pbk in enumerate(configuration.agent_pbks)
+        )  # type: Dict[str, AgentStateView]
 
-        self.good_states = dict(
-            (good_pbk, GoodState(DEFAULT_PRICE)) for good_pbk in configuration.good_pbks
-        )  # type: Dict[str, GoodState]
+        self._prices = np.full(configuration.nb_goods, DEFAULT_PRICE, dtype=np.float64)
+        self._good_states = {}  # type: Dict[str, GoodStateView]
 
     @property
     def initialization(self) -> GameInitialization:
@@ -293,10 +399,41 @@ class Game:
         return self._configuration
 
     @property
-    def initial_agent_states(self) -> Dict[str, "AgentState"]:
-        """Get initial state of each agent."""
+    def initial_agent_states(self) -> Dict[str, AgentStateView]:
+        """
+        Get initial state of each agent.
+
+        The views on the initial state are only built on the first access.
+        """
+        if not self._initial_agent_states:
+            self._initial_agent_states = dict(
+                (
+                    agent_pbk,
+                    AgentStateView(
+                        self._initial_balances,
+                        self._initial_holdings,
+                        self._utility_params,
+                        i,
+                    ),
+                )
+                for agent_pbk, i in self._agent_pbk_to_idx.items()
+            )
         return self._initial_agent_states
 
+    @property
+    def good_states(self) -> Dict[str, GoodStateView]:
+        """
+        Get the state of each good.
+
+        The views on the prices are only built on the first access.
+        """
+        if not self._good_states:
+            self._good_states = dict(
+                (good_pbk, GoodStateView(self._prices, i))
+                for i, good_pbk in enumerate(self.configuration.good_pbks)
+            )
+        return self._good_states
+
     @staticmethod
     def generate_game(
         version_id: str,
@@ -357,21 +494,28 @@ class Game:
 
         return Game(game_configuration, game_initialization)
 
+    def _compute_scores(self, balances: np.ndarray, holdings: np.ndarray) -> np.ndarray:
+        """
+        Compute the scores of all the agents at once.
+
+        :param balances: the balances of the agents.
+        :param holdings: the holdings matrix of the agents.
+        :return: the vector of scores.
+        """
+        return logarithmic_utilities(self._utility_params, holdings) + balances
+
     def get_initial_scores(self) -> List[float]:
         """Get the initial scores for every agent."""
-        return [
-            agent_state.get_score()
-            for agent_state in self.initial_agent_states.values()
-        ]
+        return self._compute_scores(
+            self._initial_balances, self._initial_holdings
+        ).tolist()
 
     def get_scores(self) -> Dict[str, float]:
         """Get the current scores for every agent."""
-        return {
-            agent_pbk: agent_state.get_score()
-            for agent_pbk, agent_state in self.agent_states.items()
-        }
+        scores = self._compute_scores(self._balances, self._holdings)
+        return dict(zip(self.configuration.agent_pbks, scores.tolist()))
 
-    def get_agent_state_from_agent_pbk(self, agent_pbk: Address) -> "AgentState":
+    def get_agent_state_from_agent_pbk(self, agent_pbk: Address) -> AgentStateView:
         """
         Get agent state from agent pbk.
 
@@ -388,18 +532,36 @@ class Game:
         :return: True if the transaction is valid, False otherwise.
         :raises: AssertionError: if the data in the transaction are not allowed (e.g. negative amount).
         """
+        agent_pbk_to_idx = self._agent_pbk_to_idx
+        return self._is_transaction_valid(
+            tx, agent_pbk_to_idx[tx.buyer_pbk], agent_pbk_to_idx[tx.seller_pbk]
+        )
+
+    def _is_transaction_valid(
+        self, tx: Transaction, buyer_idx: int, seller_idx: int
+    ) -> bool:
+        """
+        Check whether the transaction is valid, given the indices of the buyer and the seller.
+
+        :param tx: the transaction.
+        :param buyer_idx: the index of the buyer.
+        :param seller_idx: the index of the seller.
+        :return: True if the transaction is valid, False otherwise.
+        """
         # check if the buyer has enough balance to pay the transaction.
-        share_of_tx_fee = round(self.configuration.tx_fee / 2.0, 2)
-        if self.agent_states[tx.buyer_pbk].balance < tx.amount + share_of_tx_fee:
+        if self._balances[buyer_idx] < tx.amount + self._configuration.share_of_tx_fee:
             return False
 
-        # check if we have enough instances of goods, for every good involved in the transaction.
-        seller_holdings = self.agent_states[tx.seller_pbk].current_holdings
-        for good_id, bought_quantity in enumerate(tx.quantities_by_good_pbk.values()):
-            if seller_holdings[good_id] < bought_quantity:
-                return False
+        # check that the transaction does not give more quantities than there are goods.
+        # it may give fewer: the goods it leaves out are not traded.
+        quantities = tx.quantities_array
+        nb_goods = len(quantities)
+        if nb_goods > self._configuration.nb_goods:
+            return False
 
-        return True
+        # check if we have enough instances of goods, for every good involved in the transaction.
+        seller_holdings = self._holdings[seller_idx, :nb_goods]
+        return bool((seller_holdings >= quantities).all())
 
     def settle_transaction(self, tx: Transaction) -> None:
         """
@@ -447,11 +609,11 @@ class Game:
         >>> agent_state_1 = game.agent_states['tac_agent_1_pbk'] # agent state of tac_agent_1
         >>> agent_state_2 = game.agent_states['tac_agent_2_pbk'] # agent state of tac_agent_2
         >>> agent_state_0.balance, agent_state_0.current_holdings
-        (20, [1, 1, 1])
+        (20.0, [1, 1, 1])
         >>> agent_state_1.balance, agent_state_1.current_holdings
-        (20, [2, 1, 1])
+        (20.0, [2, 1, 1])
         >>> agent_state_2.balance, agent_state_2.current_holdings
-        (20, [1, 1, 2])
+        (20.0, [1, 1, 2])
         >>> tx = Transaction('some_tx_id', True, 'tac_agent_1_pbk', 15, {'tac_good_0': 1, 'tac_good_1': 0, 'tac_good_2': 0}, 'tac_agent_0_pbk')
         >>> game.settle_transaction(tx)
         >>> agent_state_0.balance, agent_state_0.current_holdings
@@ -463,29 +625,108 @@ class Game:
         :return: None
         :raises: AssertionError if the transaction is not valid.
         """
-        assert self.is_transaction_valid(tx)
+        agent_pbk_to_idx = self._agent_pbk_to_idx
+        buyer_idx = agent_pbk_to_idx[tx.buyer_pbk]
+        seller_idx = agent_pbk_to_idx[tx.seller_pbk]
+        assert self._is_transaction_valid(tx, buyer_idx, seller_idx)
         self.transactions.append(tx)
-        buyer_state = self.agent_states[tx.buyer_pbk]
-        seller_state = self.agent_states[tx.seller_pbk]
+        amount = tx.amount
+
+        # update holdings
+        holdings = self._holdings
+        quantities = tx.quantities_array
+        nb_goods_involved = len(quantities)
+        holdings[buyer_idx, :nb_goods_involved] += quantities
+        holdings[seller_idx, :nb_goods_involved] -= quantities
+
+        # update prices of the traded goods
+        nb_instances_traded = tx.total_quantity
+        if nb_instances_traded > 0:
+            # for now the price is simply the amount proportional to the share in the bundle
+            price = amount / nb_instances_traded
+            self._prices[np.flatnonzero(quantities)] = price
+
+        share_of_tx_fee = self._configuration.share_of_tx_fee
+        # update balances and charge share of fee to buyer and seller
+        balances = self._balances
+        balances[buyer_idx] -= amount + share_of_tx_fee
+        balances[seller_idx] += amount - share_of_tx_fee
 
-        nb_instances_traded = sum(tx.quantities_by_good_pbk.values())
+    def replay(self, transactions: Sequence[Transaction]) -> None:
+        """
+        Settle a sequence of valid transactions, in order.
 
-        # update holdings and prices
-        for good_id, (good_pbk, quantity) in enumerate(
-            tx.quantities_by_good_pbk.items()
-        ):
-            buyer_state._current_holdings[good_id] += quantity
-            seller_state._current_holdings[good_id] -= quantity
-            if quantity > 0:
-                # for now the price is simply the amount proportional to the share in the bundle
-                price = tx.amount / nb_instances_traded
-                good_state = self.good_states[good_pbk]
-                good_state.price = price
-
-        share_of_tx_fee = round(self.configuration.tx_fee / 2.0, 2)
-        # update balances and charge share of fee to buyer and seller
-        buyer_state.balance -= tx.amount + share_of_tx_fee
-        seller_state.balance += tx.amount - share_of_tx_fee
+        The transactions are settled by batches, with vectorized operations over each batch:
+        the state after every transaction is obtained with a cumulative sum of the changes it makes.
+        If a transaction of a batch is not valid at its turn, the batch is settled one transaction at a time,
+        so that the error is raised exactly as in settle_transaction.
+
+        :param transactions: the transactions.
+        :return: None
+        :raises: AssertionError if a transaction is not valid.
+        """
+        for start in range(0, len(transactions), REPLAY_BATCH_SIZE):
+            batch = transactions[slice(start, start + REPLAY_BATCH_SIZE)]
+            if not self._replay_batch(batch):
+                for tx in batch:
+                    self.settle_transaction(tx)
+
+    def _replay_batch(self, transactions: Sequence[Transaction]) -> bool:
+        """
+        Settle a batch of transactions with vectorized operations, if all of them are valid.
+
+        :param transactions: the transactions.
+        :return: True if the transactions have been settled, False if one of them is not valid.
+        """
+        nb_transactions = len(transactions)
+        nb_agents, nb_goods = self._holdings.shape
+        agent_pbk_to_idx = self._agent_pbk_to_idx
+        share_of_tx_fee = self._configuration.share_of_tx_fee
+
+        buyer_idxs = np.empty(nb_transactions, dtype=np.intp)
+        seller_idxs = np.empty(nb_transactions, dtype=np.intp)
+        amounts = np.empty(nb_transactions, dtype=np.float64)
+        quantities = np.zeros((nb_transactions, nb_goods), dtype=np.int32)
+        for i, tx in enumerate(transactions):
+            buyer_idxs[i] = agent_pbk_to_idx[tx.buyer_pbk]
+            seller_idxs[i] = agent_pbk_to_idx[tx.seller_pbk]
+            amounts[i] = tx.amount
+            tx_quantities = tx.quantities_array
+            quantities[i, : len(tx_quantities)] = tx_quantities
+
+        # the first row is the current state, the other rows are the changes made by every transaction.
+        steps = np.arange(1, nb_transactions + 1)
+        holdings = np.zeros((nb_transactions + 1, nb_agents, nb_goods), dtype=np.int64)
+        holdings[0] = self._holdings
+        holdings[steps, buyer_idxs] = quantities
+        holdings[steps, seller_idxs] = -quantities
+        balances = np.zeros((nb_transactions + 1, nb_agents), dtype=np.float64)
+        balances[0] = self._balances
+        balances[steps, buyer_idxs] = -(amounts + share_of_tx_fee)
+        balances[steps, seller_idxs] = amounts - share_of_tx_fee
+        np.cumsum(holdings, axis=0, out=holdings)
+        np.cumsum(balances, axis=0, out=balances)
+
+        # a transaction is valid iff neither the buyer balance nor the seller holdings become negative.
+        if (balances[steps, buyer_idxs] < 0).any() or (
+            holdings[steps, seller_idxs] < 0
+        ).any():
+            return False
+
+        self._holdings[:] = holdings[-1]
+        self._balances[:] = balances[-1]
+
+        # the price of a good is the one of the last transaction that traded it.
+        is_traded = quantities > 0
+        is_ever_traded = is_traded.any(axis=0)
+        last_trades = nb_transactions - 1 - np.argmax(is_traded[::-1], axis=0)
+        last_trades = last_trades[is_ever_traded]
+        self._prices[is_ever_traded] = amounts[last_trades] / quantities[
+            last_trades
+        ].sum(axis=1)
+
+        self.transactions.extend(transactions)
+        return True
 
     def get_holdings_matrix(self) -> List[Endowment]:
         """
@@ -493,23 +734,15 @@ class Game:
 
         :return: the holdings matrix.
         """
-        result = list(
-            map(lambda state: state.current_holdings, self.agent_states.values())
-        )
-        return result
+        return self._holdings.tolist()
 
     def get_balances(self) -> Dict[str, float]:
         """Get the current balances."""
-        result = {
-            agent_pbk: agent_state.balance
-            for agent_pbk, agent_state in self.agent_states.items()
-        }
-        return result
+        return dict(zip(self.configuration.agent_pbks, self._balances.tolist()))
 
     def get_prices(self) -> List[float]:
         """Get the current prices."""
-        result = list(map(lambda state: state.price, self.good_states.values()))
-        return result
+        return self._prices.tolist()
 
     def get_holdings_summary(self) -> str:
         """
@@ -560,44 +793,43 @@ class Game:
 
         :return: a string representing the holdings for every agent.
         """
-        result = ""
-        for agent_pbk, agent_state in self.agent_states.items():
-            result = (
-                result
-                + self.configuration.agent_pbk_to_name[agent_pbk]
-                + " "
-                + str(agent_state.current_holdings)
-                + "\n"
+        lines = [
+            "{} {}".format(agent_name, holdings)
+            for agent_name, holdings in zip(
+                self.configuration.agent_names, self._holdings.tolist()
             )
-        return result
+        ]
+        return "\n".join(lines) + "\n"
 
     def get_holdings_dict(self) -> Dict[str, List[int]]:
         """Get a dictionary of current holdings."""
-        result = {}
-        for agent_pbk, agent_state in self.agent_states.items():
-            result[agent_pbk] = agent_state.current_holdings
-        return result
+        return dict(zip(self.configuration.agent_pbks, self._holdings.tolist()))
 
     def get_equilibrium_summary(self) -> str:
         """Get equilibrium summary."""
-        result = "Equilibrium prices: \n"
-        for good_pbk, eq_price in zip(
-            self.configuration.good_pbks, self.initialization.eq_prices
-        ):
-            result = result + good_pbk + " " + str(eq_price) + "\n"
-        result = result + "\n"
-        result = result + "Equilibrium good allocation: \n"
-        for agent_name, eq_allocations in zip(
-            self.configuration.agent_names, self.initialization.eq_good_holdings
-        ):
-            result = result + agent_name + " " + str(eq_allocations) + "\n"
-        result = result + "\n"
-        result = result + "Equilibrium money allocation: \n"
-        for agent_name, eq_allocation in zip(
-            self.configuration.agent_names, self.initialization.eq_money_holdings
-        ):
-            result = result + agent_name + " " + str(eq_allocation) + "\n"
-        return result
+        agent_names = self.configuration.agent_names
+        lines = ["Equilibrium prices: "]
+        lines.extend(
+            "{} {}".format(good_pbk, eq_price)
+            for good_pbk, eq_price in zip(
+                self.configuration.good_pbks, self.initialization.eq_prices
+            )
+        )
+        lines.extend(["", "Equilibrium good allocation: "])
+        lines.extend(
+            "{} {}".format(agent_name, eq_allocations)
+            for agent_name, eq_allocations in zip(
+                agent_names, self.initialization.eq_good_holdings
+            )
+        )
+        lines.extend(["", "Equilibrium money allocation: "])
+        lines.extend(
+            "{} {}".format(agent_name, eq_allocation)
+            for agent_name, eq_allocation in zip(
+                agent_names, self.initialization.eq_money_holdings
+            )
+        )
+        return "\n".join(lines) + "\n"
 
     def to_dict(self) -> Dict[str, Any]:
         """Get a dictionary from the object."""
@@ -614,9 +846,7 @@ class Game:
         initialization = GameInitialization.from_dict(d["initialization"])
 
         game = Game(configuration, initialization)
-        for tx_dict in d["transactions"]:
-            tx = Transaction.from_dict(tx_dict)
-            game.settle_transaction(tx)
+        game.replay([Transaction.from_dict(tx_dict) for tx_dict in d["transactions"]])
 
         return game
 
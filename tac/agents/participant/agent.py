@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the base class of the TAC participant agents."""
+
+import logging
+import time
+from abc import ABC
+from typing import Optional
+
+from aea.channels.oef.connection import OEFMailBox
+from tac.agents.base import TACAgent
+
+logger = logging.getLogger(__name__)
+
+
+class BaseParticipantAgent(TACAgent, ABC):
+    """
+    The base participant agent class implements the parts shared by the participant agents.
+
+    Subclasses are expected to provide the game instance and the OEF handler.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        oef_addr: str,
+        oef_port: int,
+        private_key_pem: Optional[str] = None,
+        agent_timeout: float = 1.0,
+        debug: bool = False,
+    ):
+        """
+        Initialize a participant agent.
+
+        :param name: the name of the agent.
+        :param oef_addr: the TCP/IP address of the OEF node.
+        :param oef_port: the TCP/IP port of the OEF node.
+        :param private_key_pem: the path to a private key in PEM format.
+        :param agent_timeout: the time in (fractions of) seconds to time out an agent between act and react.
+        :param debug: if True, run the agent in debug mode.
+        """
+        super().__init__(name, private_key_pem, agent_timeout, debug=debug)
+        self.mailbox = OEFMailBox(self.crypto.public_key, oef_addr, oef_port)
+
+    def update(self) -> None:
+        """
+        Update the state of the agent.
+
+        :return: None
+        """
+        self.game_instance.transaction_manager.cleanup_pending_transactions()
+
+    def stop(self) -> None:
+        """
+        Stop the agent.
+
+        :return: None
+        """
+        super().stop()
+        self.game_instance.stop()
+
+    def start(self, rejoin: bool = False) -> None:
+        """
+        Start the agent.
+
+        :return: None
+        """
+        try:
+            self.oef_handler.rejoin = rejoin
+            super().start()
+            self.oef_handler.rejoin = False
+            self.stop()
+            return
+        except Exception as e:
+            logger.exception(e)
+            logger.debug("Stopping the agent...")
+            self.stop()
+
+        # here only if an error occurred
+        logger.debug("Trying to rejoin in 5 seconds...")
+        time.sleep(5.0)
+        self.start(rejoin=True)
+
+    def setup(self) -> None:
+        """Set up the agent."""
+
+    def teardown(self) -> None:
+        """Tear down the agent."""
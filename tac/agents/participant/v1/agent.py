@@ -21,12 +21,10 @@
 """This module contains a base implementation of an agent for TAC."""
 
 import logging
-import time
 from typing import Optional
 
-from aea.agent import Agent
-from aea.channels.oef.connection import OEFMailBox
 from aea.mail.base import Envelope
+from tac.agents.participant.agent import BaseParticipantAgent
 from tac.agents.participant.v1.base.game_instance import GameInstance
 from tac.agents.participant.v1.base.handlers import (
     ControllerHandler,
@@ -40,7 +38,7 @@ from tac.platform.game.base import GamePhase
 logger = logging.getLogger(__name__)
 
 
-class ParticipantAgent(Agent):
+class ParticipantAgent(BaseParticipantAgent):
     """The participant agent class implements a base agent for TAC."""
 
     def __init__(
@@ -74,8 +72,9 @@ class ParticipantAgent(Agent):
         :param private_key_pem: the path to a private key in PEM format.
         :param debug: if True, run the agent in debug mode.
         """
-        super().__init__(name, private_key_pem, agent_timeout, debug=debug)
-        self.mailbox = OEFMailBox(self.crypto.public_key, oef_addr, oef_port)
+        super().__init__(
+            name, oef_addr, oef_port, private_key_pem, agent_timeout, debug=debug
+        )
 
         self._game_instance = GameInstance(
             name,
@@ -97,12 +96,28 @@ class ParticipantAgent(Agent):
         self.dialogue_handler = DialogueHandler(
             self.crypto, self.liveness, self.game_instance, self.mailbox, self.name
         )
+        self._is_tac_search_queued = False
 
     @property
     def game_instance(self) -> GameInstance:
         """Get the game instance."""
         return self._game_instance
 
+    def start(self, rejoin: bool = False) -> None:
+        """
+        Start the agent.
+
+        The first search for the controller is queued before connecting to the OEF,
+        so that it is sent as soon as the connection is established instead of after the first act.
+
+        :param rejoin: whether the agent is rejoining the competition.
+        :return: None
+        """
+        if self.game_instance.game_phase == GamePhase.PRE_GAME:
+            self.oef_handler.search_for_tac()
+            self._is_tac_search_queued = True
+        super().start(rejoin)
+
     def act(self) -> None:
         """
         Perform the agent's actions.
@@ -110,7 +125,10 @@ class ParticipantAgent(Agent):
         :return: None
         """
         if self.game_instance.game_phase == GamePhase.PRE_GAME:
-            self.oef_handler.search_for_tac()
+            if self._is_tac_search_queued:
+                self._is_tac_search_queued = False
+            else:
+                self.oef_handler.search_for_tac()
         if self.game_instance.game_phase == GamePhase.GAME:
             if self.game_instance.is_time_to_update_services():
                 self.oef_handler.update_services()
@@ -142,48 +160,3 @@ class ParticipantAgent(Agent):
                     logger.warning(
                         "Message type not recognized: sender={}".format(envelope.sender)
                     )
-
-    def update(self) -> None:
-        """
-        Update the state of the agent.
-
-        :return: None
-        """
-        self.game_instance.transaction_manager.cleanup_pending_transactions()
-
-    def stop(self) -> None:
-        """
-        Stop the agent.
-
-        :return: None
-        """
-        super().stop()
-        self.game_instance.stop()
-
-    def start(self, rejoin: bool = False) -> None:
-        """
-        Start the agent.
-
-        :return: None
-        """
-        try:
-            self.oef_handler.rejoin = rejoin
-            super().start()
-            self.oef_handler.rejoin = False
-            self.stop()
-            return
-        except Exception as e:
-            logger.exception(e)
-            logger.debug("Stopping the agent...")
-            self.stop()
-
-        # here only if an error occurred
-        logger.debug("Trying to rejoin in 5 seconds...")
-        time.sleep(5.0)
-        self.start(rejoin=True)
-
-    def setup(self) -> None:
-        """Set up the agent."""
-
-    def teardown(self) -> None:
-        """Tear down the agent."""
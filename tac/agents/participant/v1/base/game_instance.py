@@ -21,6 +21,7 @@
 """This class manages the state and some services related to the TAC for an agent."""
 
 import datetime
+import math
 import random
 from typing import Any, List, Optional, Set, Tuple, Dict, Union, Sequence, cast
 
@@ -30,6 +31,7 @@ from aea.protocols.oef.models import Description, Query
 
 from tac.agents.participant.v1.base.dialogues import Dialogues, Dialogue
 from tac.agents.participant.v1.base.helpers import (
+    QUANTITY_SHIFT,
     build_dict,
     build_query,
     get_goods_quantities_description,
@@ -124,6 +126,12 @@ class GameInstance:
             agent_name, pending_transaction_timeout=pending_transaction_timeout
         )
 
+        self._cache_version = None  # type: Optional[int]
+        self._states_after_locks = {}  # type: Dict[bool, AgentState]
+        self._marginal_utilities = None  # type: Optional[List[float]]
+        self._service_descriptions = {}  # type: Dict[bool, Description]
+        self._candidate_proposals = {}  # type: Dict[bool, List[Description]]
+
         self.stats_manager = StatsManager(mail_stats, dashboard)
 
         self.dashboard = dashboard
@@ -157,13 +165,15 @@ class GameInstance:
             game_data.money, game_data.endowment, game_data.utility_params
         )
         if self.strategy.is_world_modeling:
-            opponent_pbks = self.game_configuration.agent_pbks
-            opponent_pbks.remove(agent_pbk)
+            opponent_pbks = [
+                pbk for pbk in self.game_configuration.agent_pbks if pbk != agent_pbk
+            ]
             self._world_state = WorldState(
                 opponent_pbks,
                 self.game_configuration.good_pbks,
                 self.initial_agent_state,
             )
+        self._cache_version = None
 
     def on_state_update(self, message: TACMessage, agent_pbk: Address) -> None:
         """
@@ -276,6 +286,7 @@ class GameInstance:
         Check if a transaction is profitable.
 
         Is it a profitable transaction?
+        - check that an upper bound of the score difference is acceptable (without applying the locks).
         - apply all the locks for role.
         - check if the transaction is consistent with the locks (enough money/holdings)
         - check that we gain score.
@@ -285,17 +296,29 @@ class GameInstance:
 
         :return: True if the transaction is good (as stated above), False otherwise.
         """
+        tx_fee = self.game_configuration.tx_fee
+        score_diff_upper_bound = self._get_score_diff_upper_bound(
+            transaction, self.game_configuration.share_of_tx_fee
+        )
+        if not self.strategy.is_acceptable_proposal(score_diff_upper_bound):
+            message = "[{}]: is good proposal for {}? False: tx_id={}, delta_score<={}, amount={}".format(
+                self.agent_name,
+                dialogue.role,
+                transaction.transaction_id,
+                score_diff_upper_bound,
+                transaction.amount,
+            )
+            return False, message
+
         state_after_locks = self.state_after_locks(dialogue.is_seller)
 
-        if not state_after_locks.check_transaction_is_consistent(
-            transaction, self.game_configuration.tx_fee
-        ):
+        if not state_after_locks.check_transaction_is_consistent(transaction, tx_fee):
             message = "[{}]: the proposed transaction is not consistent with the state after locks.".format(
                 self.agent_name
             )
             return False, message
         proposal_delta_score = state_after_locks.get_score_diff_from_transaction(
-            transaction, self.game_configuration.tx_fee
+            transaction, tx_fee
         )
 
         result = self.strategy.is_acceptable_proposal(proposal_delta_score)
@@ -309,6 +332,52 @@ class GameInstance:
         )
         return result, message
 
+    def _get_score_diff_upper_bound(
+        self, transaction: Transaction, share_of_tx_fee: float
+    ) -> float:
+        """
+        Get an upper bound of the score difference caused by a transaction.
+
+        The utility is concave in the holdings, so the marginal utilities at the current holdings
+        bound the utility difference from above. The locks of a role only move the holdings in the
+        same direction as the transaction, hence the bound also holds for the state after locks.
+
+        :param transaction: the transaction
+        :param share_of_tx_fee: the share of the transaction fee paid by the agent
+
+        :return: the upper bound of the score difference.
+        """
+        marginal_utilities = self._get_marginal_utilities()
+        utility_diff_bound = sum(
+            marginal_utility * quantity
+            for marginal_utility, quantity in zip(
+                marginal_utilities, transaction.quantities
+            )
+            if quantity != 0
+        )
+        if transaction.is_sender_buyer:
+            return utility_diff_bound - transaction.amount - share_of_tx_fee
+        else:
+            return transaction.amount - utility_diff_bound - share_of_tx_fee
+
+    def _get_marginal_utilities(self) -> List[float]:
+        """
+        Get the marginal utility of each good at the current holdings of the agent.
+
+        :return: the marginal utilities, cached until the state of the agent changes.
+        """
+        self._check_cache_version()
+        if self._marginal_utilities is None:
+            self._marginal_utilities = [
+                param / (quantity + QUANTITY_SHIFT)
+                if quantity + QUANTITY_SHIFT > 0
+                else math.inf
+                for param, quantity in zip(
+                    self.agent_state.utility_params, self.agent_state.current_holdings
+                )
+            ]
+        return self._marginal_utilities
+
     def get_service_description(self, is_supply: bool) -> Description:
         """
         Get the description of the supplied goods (as a seller), or the demanded goods (as a buyer).
@@ -317,11 +386,15 @@ class GameInstance:
 
         :return: the description (to advertise on the Service Directory).
         """
-        desc = get_goods_quantities_description(
-            self.game_configuration.good_pbks,
-            self.get_goods_quantities(is_supply),
-            is_supply=is_supply,
-        )
+        self._check_cache_version()
+        desc = self._service_descriptions.get(is_supply)
+        if desc is None:
+            desc = get_goods_quantities_description(
+                self.game_configuration.good_pbks,
+                self.get_goods_quantities(is_supply),
+                is_supply=is_supply,
+            )
+            self._service_descriptions[is_supply] = desc
         return desc
 
     def build_services_query(self, is_searching_for_sellers: bool) -> Optional[Query]:
@@ -427,20 +500,25 @@ class GameInstance:
         Apply all the locks to the current state of the agent.
 
         This assumes, that all the locked transactions will be successful.
+        The resulting state is cached until the locks change, hence it must not be modified.
 
         :param is_seller: Boolean indicating the role of the agent.
 
         :return: the agent state with the locks applied to current state
         """
         assert self._agent_state is not None, "Agent state not assigned!"
-        transactions = (
-            list(self.transaction_manager.locked_txs_as_seller.values())
-            if is_seller
-            else list(self.transaction_manager.locked_txs_as_buyer.values())
-        )
-        state_after_locks = self._agent_state.apply(
-            transactions, self.game_configuration.tx_fee
-        )
+        self._check_cache_version()
+        state_after_locks = self._states_after_locks.get(is_seller)
+        if state_after_locks is None:
+            transactions = (
+                list(self.transaction_manager.locked_txs_as_seller.values())
+                if is_seller
+                else list(self.transaction_manager.locked_txs_as_buyer.values())
+            )
+            state_after_locks = self._agent_state.apply(
+                transactions, self.game_configuration.tx_fee
+            )
+            self._states_after_locks[is_seller] = state_after_locks
         return state_after_locks
 
     def generate_proposal(
@@ -454,28 +532,65 @@ class GameInstance:
         :param cfp_services: the query associated with the cfp.
         :param is_seller: Boolean indicating the role of the agent.
 
-        :return: a list of descriptions
+        :return: a proposal, or None if no proposal matches the cfp.
         """
-        state_after_locks = self.state_after_locks(is_seller=is_seller)
-        candidate_proposals = self.strategy.get_proposals(
-            self.game_configuration.good_pbks,
-            state_after_locks.current_holdings,
-            state_after_locks.utility_params,
-            self.game_configuration.tx_fee,
-            is_seller,
-            self._world_state,
-        )
-        proposals = []
+        candidate_proposals = self._get_candidate_proposals(is_seller)
+        # reservoir sampling: pick uniformly at random among the matching proposals, in a single pass.
+        chosen_proposal = None
+        nb_matching_proposals = 0
         for proposal in candidate_proposals:
             if not self.is_matching(cfp_services, proposal):
                 continue
             if not proposal.values["price"] > 0:
                 continue
-            proposals.append(proposal)
-        if not proposals:
-            return None
-        else:
-            return random.choice(proposals)
+            nb_matching_proposals += 1
+            if random.randrange(nb_matching_proposals) == 0:
+                chosen_proposal = proposal
+        return chosen_proposal
+
+    def _get_candidate_proposals(self, is_seller: bool) -> List[Description]:
+        """
+        Get the candidate proposals of the strategy, given the state after locks.
+
+        The proposals are cached until the state of the agent changes. With world modeling,
+        the proposals also depend on the price models, hence they are not cached.
+
+        :param is_seller: Boolean indicating the role of the agent.
+
+        :return: a list of descriptions
+        """
+        self._check_cache_version()
+        candidate_proposals = self._candidate_proposals.get(is_seller)
+        if candidate_proposals is None:
+            state_after_locks = self.state_after_locks(is_seller=is_seller)
+            candidate_proposals = self.strategy.get_proposals(
+                self.game_configuration.good_pbks,
+                state_after_locks.current_holdings,
+                state_after_locks.utility_params,
+                self.game_configuration.tx_fee,
+                is_seller,
+                self._world_state,
+            )
+            if not self.strategy.is_world_modeling:
+                self._candidate_proposals[is_seller] = candidate_proposals
+        return candidate_proposals
+
+    def _check_cache_version(self) -> None:
+        """
+        Invalidate the cached states and descriptions if the locks have changed since they were computed.
+
+        The agent state is only updated when a locked transaction is settled (which removes the lock)
+        or when the game instance is (re-)initialized (which resets the cache version).
+
+        :return: None
+        """
+        locks_version = self.transaction_manager.locks_version
+        if self._cache_version != locks_version:
+            self._states_after_locks.clear()
+            self._marginal_utilities = None
+            self._service_descriptions.clear()
+            self._candidate_proposals.clear()
+            self._cache_version = locks_version
 
     def stop(self):
         """Stop the services attached to the game instance."""
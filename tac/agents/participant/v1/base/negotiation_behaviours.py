@@ -48,6 +48,8 @@ STARTING_MESSAGE_ID = 1
 class FIPABehaviour:
     """Specifies FIPA negotiation behaviours."""
 
+    __slots__ = ("_crypto", "_agent_pbk", "_game_instance", "_agent_name")
+
     def __init__(
         self, crypto: Crypto, game_instance: GameInstance, agent_name: str
     ) -> None:
@@ -61,6 +63,7 @@ class FIPABehaviour:
         :return: None
         """
         self._crypto = crypto
+        self._agent_pbk = crypto.public_key
         self._game_instance = game_instance
         self._agent_name = agent_name
 
@@ -88,14 +91,20 @@ class FIPABehaviour:
 
         :return: a Propose or a Decline
         """
+        game_instance = self._game_instance
+        transaction_manager = game_instance.transaction_manager
+        msg_id = cfp.get("id")
+        dialogue_id = cfp.get("dialogue_id")
+        target = cfp.get("target")
+        dialogue_label = dialogue.dialogue_label
+        opponent_pbk = dialogue_label.dialogue_opponent_pbk
+        is_seller = dialogue.is_seller
         assert cfp.get("performative") == FIPAMessage.Performative.CFP
-        goods_description = self.game_instance.get_service_description(
-            is_supply=dialogue.is_seller
-        )
-        new_msg_id = cfp.get("id") + 1
+        goods_description = game_instance.get_service_description(is_supply=is_seller)
+        new_msg_id = msg_id + 1
         decline = False
         cfp_services = json.loads(cfp.get("query").decode("utf-8"))
-        if not self.game_instance.is_matching(cfp_services, goods_description):
+        if not game_instance.is_matching(cfp_services, goods_description):
             decline = True
             logger.debug(
                 "[{}]: Current holdings do not satisfy CFP query.".format(
@@ -103,9 +112,7 @@ class FIPABehaviour:
                 )
             )
         else:
-            proposal = self.game_instance.generate_proposal(
-                cfp_services, dialogue.is_seller
-            )
+            proposal = game_instance.generate_proposal(cfp_services, is_seller)
             if proposal is None:
                 decline = True
                 logger.debug(
@@ -115,83 +122,85 @@ class FIPABehaviour:
                 )
 
         if decline:
-            logger.debug(
-                "[{}]: sending to {} a Decline{}".format(
-                    self.agent_name,
-                    dialogue.dialogue_label.dialogue_opponent_pbk,
-                    pprint.pformat(
-                        {
-                            "msg_id": new_msg_id,
-                            "dialogue_id": cfp.get("dialogue_id"),
-                            "origin": dialogue.dialogue_label.dialogue_opponent_pbk,
-                            "target": cfp.get("target"),
-                        }
-                    ),
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[{}]: sending to {} a Decline{}".format(
+                        self.agent_name,
+                        opponent_pbk,
+                        pprint.pformat(
+                            {
+                                "msg_id": new_msg_id,
+                                "dialogue_id": dialogue_id,
+                                "origin": opponent_pbk,
+                                "target": target,
+                            }
+                        ),
+                    )
                 )
-            )
             msg = FIPAMessage(
                 message_id=new_msg_id,
-                dialogue_id=cfp.get("dialogue_id"),
+                dialogue_id=dialogue_id,
                 performative=FIPAMessage.Performative.DECLINE,
-                target=cfp.get("id"),
+                target=msg_id,
             )
             dialogue.outgoing_extend([msg])
             msg_bytes = FIPASerializer().encode(msg)
             response = Envelope(
-                to=dialogue.dialogue_label.dialogue_opponent_pbk,
-                sender=self.crypto.public_key,
+                to=opponent_pbk,
+                sender=self._agent_pbk,
                 protocol_id=FIPAMessage.protocol_id,
                 message=msg_bytes,
             )
-            self.game_instance.stats_manager.add_dialogue_endstate(
+            game_instance.stats_manager.add_dialogue_endstate(
                 EndState.DECLINED_CFP, dialogue.is_self_initiated
             )
         else:
             proposal = cast(Description, proposal)
             transaction_id = generate_transaction_id(
-                self.crypto.public_key,
-                dialogue.dialogue_label.dialogue_opponent_pbk,
-                dialogue.dialogue_label,
-                dialogue.is_seller,
+                self._agent_pbk,
+                opponent_pbk,
+                dialogue_label,
+                is_seller,
             )
             transaction = Transaction.from_proposal(
                 proposal=proposal,
                 transaction_id=transaction_id,
-                is_sender_buyer=not dialogue.is_seller,
-                counterparty=dialogue.dialogue_label.dialogue_opponent_pbk,
-                sender=self.crypto.public_key,
+                is_sender_buyer=not is_seller,
+                counterparty=opponent_pbk,
+                sender=self._agent_pbk,
             )
-            self.game_instance.transaction_manager.add_pending_proposal(
-                dialogue.dialogue_label, new_msg_id, transaction
+            transaction_manager.add_pending_proposal(
+                dialogue_label, new_msg_id, transaction
             )
-            logger.debug(
-                "[{}]: sending to {} a Propose{}".format(
-                    self.agent_name,
-                    dialogue.dialogue_label.dialogue_opponent_pbk,
-                    pprint.pformat(
-                        {
-                            "msg_id": new_msg_id,
-                            "dialogue_id": cfp.get("dialogue_id"),
-                            "origin": dialogue.dialogue_label.dialogue_opponent_pbk,
-                            "target": cfp.get("id"),
-                            "propose": proposal.values,
-                        }
-                    ),
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[{}]: sending to {} a Propose{}".format(
+                        self.agent_name,
+                        opponent_pbk,
+                        pprint.pformat(
+                            {
+                                "msg_id": new_msg_id,
+                                "dialogue_id": dialogue_id,
+                                "origin": opponent_pbk,
+                                "target": msg_id,
+                                "propose": proposal.values,
+                            }
+                        ),
+                    )
                 )
-            )
             msg = FIPAMessage(
                 performative=FIPAMessage.Performative.PROPOSE,
                 message_id=new_msg_id,
-                dialogue_id=cfp.get("dialogue_id"),
-                target=cfp.get("id"),
+                dialogue_id=dialogue_id,
+                target=msg_id,
                 proposal=[proposal],
             )
             dialogue.outgoing_extend([msg])
             dialogue.outgoing_extend([msg])
             msg_bytes = FIPASerializer().encode(msg)
             response = Envelope(
-                to=dialogue.dialogue_label.dialogue_opponent_pbk,
-                sender=self.crypto.public_key,
+                to=opponent_pbk,
+                sender=self._agent_pbk,
                 protocol_id=FIPAMessage.protocol_id,
                 message=msg_bytes,
             )
@@ -206,27 +215,34 @@ class FIPABehaviour:
 
         :return: an Accept or a Decline
         """
+        game_instance = self._game_instance
+        transaction_manager = game_instance.transaction_manager
+        msg_id = propose.get("id")
+        dialogue_id = propose.get("dialogue_id")
+        dialogue_label = dialogue.dialogue_label
+        opponent_pbk = dialogue_label.dialogue_opponent_pbk
+        is_seller = dialogue.is_seller
         logger.debug("[{}]: on propose as {}.".format(self.agent_name, dialogue.role))
         assert propose.get("performative") == FIPAMessage.Performative.PROPOSE
         proposal = propose.get("proposal")[0]
         transaction_id = generate_transaction_id(
-            self.crypto.public_key,
-            dialogue.dialogue_label.dialogue_opponent_pbk,
-            dialogue.dialogue_label,
-            dialogue.is_seller,
+            self._agent_pbk,
+            opponent_pbk,
+            dialogue_label,
+            is_seller,
         )
         transaction = Transaction.from_proposal(
             proposal=proposal,
             transaction_id=transaction_id,
-            is_sender_buyer=not dialogue.is_seller,
-            counterparty=dialogue.dialogue_label.dialogue_opponent_pbk,
-            sender=self.crypto.public_key,
+            is_sender_buyer=not is_seller,
+            counterparty=opponent_pbk,
+            sender=self._agent_pbk,
         )
-        new_msg_id = propose.get("id") + 1
+        new_msg_id = msg_id + 1
         (
             is_profitable_transaction,
             propose_log_msg,
-        ) = self.game_instance.is_profitable_transaction(transaction, dialogue)
+        ) = game_instance.is_profitable_transaction(transaction, dialogue)
         logger.debug(propose_log_msg)
         if is_profitable_transaction:
             logger.debug(
@@ -234,23 +250,21 @@ class FIPABehaviour:
                     self.agent_name, dialogue.role
                 )
             )
-            self.game_instance.transaction_manager.add_locked_tx(
-                transaction, as_seller=dialogue.is_seller
-            )
-            self.game_instance.transaction_manager.add_pending_initial_acceptance(
-                dialogue.dialogue_label, new_msg_id, transaction
+            transaction_manager.add_locked_tx(transaction, as_seller=is_seller)
+            transaction_manager.add_pending_initial_acceptance(
+                dialogue_label, new_msg_id, transaction
             )
             msg = FIPAMessage(
                 message_id=new_msg_id,
-                dialogue_id=propose.get("dialogue_id"),
-                target=propose.get("id"),
+                dialogue_id=dialogue_id,
+                target=msg_id,
                 performative=FIPAMessage.Performative.ACCEPT,
             )
             dialogue.outgoing_extend([msg])
             msg_bytes = FIPASerializer().encode(msg)
             result = Envelope(
-                to=dialogue.dialogue_label.dialogue_opponent_pbk,
-                sender=self.crypto.public_key,
+                to=opponent_pbk,
+                sender=self._agent_pbk,
                 protocol_id=FIPAMessage.protocol_id,
                 message=msg_bytes,
             )
@@ -260,19 +274,19 @@ class FIPABehaviour:
             )
             msg = FIPAMessage(
                 message_id=new_msg_id,
-                dialogue_id=propose.get("dialogue_id"),
-                target=propose.get("id"),
+                dialogue_id=dialogue_id,
+                target=msg_id,
                 performative=FIPAMessage.Performative.DECLINE,
             )
             dialogue.outgoing_extend([msg])
             msg_bytes = FIPASerializer().encode(msg)
             result = Envelope(
-                to=dialogue.dialogue_label.dialogue_opponent_pbk,
-                sender=self.crypto.public_key,
+                to=opponent_pbk,
+                sender=self._agent_pbk,
                 protocol_id=FIPAMessage.protocol_id,
                 message=msg_bytes,
             )
-            self.game_instance.stats_manager.add_dialogue_endstate(
+            game_instance.stats_manager.add_dialogue_endstate(
                 EndState.DECLINED_PROPOSE, dialogue.is_self_initiated
             )
         return result
@@ -286,40 +300,45 @@ class FIPABehaviour:
 
         :return: None
         """
+        game_instance = self._game_instance
+        transaction_manager = game_instance.transaction_manager
+        msg_id = decline.get("id")
+        dialogue_id = decline.get("dialogue_id")
+        target = decline.get("target")
+        dialogue_label = dialogue.dialogue_label
+        opponent_pbk = dialogue_label.dialogue_opponent_pbk
         assert decline.get("performative") == FIPAMessage.Performative.DECLINE
-        logger.debug(
-            "[{}]: on_decline: msg_id={}, dialogue_id={}, origin={}, target={}".format(
-                self.agent_name,
-                decline.get("id"),
-                decline.get("dialogue_id"),
-                dialogue.dialogue_label.dialogue_opponent_pbk,
-                decline.get("target"),
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[{}]: on_decline: msg_id={}, dialogue_id={}, origin={}, target={}".format(
+                    self.agent_name,
+                    msg_id,
+                    dialogue_id,
+                    opponent_pbk,
+                    target,
+                )
             )
-        )
-        target = decline.get("target")
         if target == 1:
-            self.game_instance.stats_manager.add_dialogue_endstate(
+            game_instance.stats_manager.add_dialogue_endstate(
                 EndState.DECLINED_CFP, dialogue.is_self_initiated
             )
         elif target == 2:
-            self.game_instance.stats_manager.add_dialogue_endstate(
+            game_instance.stats_manager.add_dialogue_endstate(
                 EndState.DECLINED_PROPOSE, dialogue.is_self_initiated
             )
-            transaction = self.game_instance.transaction_manager.pop_pending_proposal(
-                dialogue.dialogue_label, target
+            transaction = transaction_manager.pop_pending_proposal(
+                dialogue_label, target
             )
-            if self.game_instance.strategy.is_world_modeling:
-                self.game_instance.world_state.update_on_declined_propose(transaction)
+            if game_instance.strategy.is_world_modeling:
+                game_instance.world_state.update_on_declined_propose(transaction)
         elif target == 3:
-            self.game_instance.stats_manager.add_dialogue_endstate(
+            game_instance.stats_manager.add_dialogue_endstate(
                 EndState.DECLINED_ACCEPT, dialogue.is_self_initiated
             )
-            transaction = self.game_instance.transaction_manager.pop_pending_initial_acceptance(
-                dialogue.dialogue_label, target
-            )
-            self.game_instance.transaction_manager.pop_locked_tx(
-                transaction.transaction_id
+            transaction = transaction_manager.pop_pending_initial_acceptance(
+                dialogue_label, target
             )
+            transaction_manager.pop_locked_tx(transaction.transaction_id)
 
         return None
 
@@ -331,45 +350,46 @@ class FIPABehaviour:
         :param dialogue: the dialogue
         :return: a Decline, or an Accept and a Transaction, or a Transaction (in a Message object)
         """
+        game_instance = self._game_instance
+        transaction_manager = game_instance.transaction_manager
+        msg_id = accept.get("id")
+        dialogue_id = accept.get("dialogue_id")
+        target = accept.get("target")
+        dialogue_label = dialogue.dialogue_label
+        opponent_pbk = dialogue_label.dialogue_opponent_pbk
+        proposals = transaction_manager.pending_proposals.get(dialogue_label)
         assert (
             accept.get("performative") == FIPAMessage.Performative.ACCEPT
-            and dialogue.dialogue_label
-            in self.game_instance.transaction_manager.pending_proposals
-            and accept.get("target")
-            in self.game_instance.transaction_manager.pending_proposals[
-                dialogue.dialogue_label
-            ]
+            and proposals is not None
+            and target in proposals
         )
-        logger.debug(
-            "[{}]: on_accept: msg_id={}, dialogue_id={}, origin={}, target={}".format(
-                self.agent_name,
-                accept.get("id"),
-                accept.get("dialogue_id"),
-                dialogue.dialogue_label.dialogue_opponent_pbk,
-                accept.get("target"),
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[{}]: on_accept: msg_id={}, dialogue_id={}, origin={}, target={}".format(
+                    self.agent_name,
+                    msg_id,
+                    dialogue_id,
+                    opponent_pbk,
+                    target,
+                )
             )
-        )
-        new_msg_id = accept.get("id") + 1
+        new_msg_id = msg_id + 1
         results = []
-        transaction = self.game_instance.transaction_manager.pop_pending_proposal(
-            dialogue.dialogue_label, accept.get("target")
-        )
+        transaction = transaction_manager.pop_pending_proposal(dialogue_label, target)
         (
             is_profitable_transaction,
             accept_log_msg,
-        ) = self.game_instance.is_profitable_transaction(transaction, dialogue)
+        ) = game_instance.is_profitable_transaction(transaction, dialogue)
         logger.debug(accept_log_msg)
         if is_profitable_transaction:
-            if self.game_instance.strategy.is_world_modeling:
-                self.game_instance.world_state.update_on_initial_accept(transaction)
+            if game_instance.strategy.is_world_modeling:
+                game_instance.world_state.update_on_initial_accept(transaction)
             logger.debug(
                 "[{}]: Locking the current state (as {}).".format(
                     self.agent_name, dialogue.role
                 )
             )
-            self.game_instance.transaction_manager.add_locked_tx(
-                transaction, as_seller=dialogue.is_seller
-            )
+            transaction_manager.add_locked_tx(transaction, as_seller=dialogue.is_seller)
 
             tac_msg = TACMessage(
                 tac_type=TACMessage.Type.TRANSACTION,
@@ -383,8 +403,8 @@ class FIPABehaviour:
             tac_bytes = TACSerializer().encode(tac_msg)
             results.append(
                 Envelope(
-                    to=self.game_instance.controller_pbk,
-                    sender=self.crypto.public_key,
+                    to=game_instance.controller_pbk,
+                    sender=self._agent_pbk,
                     protocol_id=TACMessage.protocol_id,
                     message=tac_bytes,
                 )
@@ -392,16 +412,16 @@ class FIPABehaviour:
 
             msg = FIPAMessage(
                 message_id=new_msg_id,
-                dialogue_id=accept.get("dialogue_id"),
-                target=accept.get("id"),
+                dialogue_id=dialogue_id,
+                target=msg_id,
                 performative=FIPAMessage.Performative.MATCH_ACCEPT,
             )
             dialogue.outgoing_extend([msg])
             msg_bytes = FIPASerializer().encode(msg)
             results.append(
                 Envelope(
-                    to=dialogue.dialogue_label.dialogue_opponent_pbk,
-                    sender=self.crypto.public_key,
+                    to=opponent_pbk,
+                    sender=self._agent_pbk,
                     protocol_id=FIPAMessage.protocol_id,
                     message=msg_bytes,
                 )
@@ -415,21 +435,21 @@ class FIPABehaviour:
 
             msg = FIPAMessage(
                 message_id=new_msg_id,
-                dialogue_id=accept.get("dialogue_id"),
-                target=accept.get("id"),
+                dialogue_id=dialogue_id,
+                target=msg_id,
                 performative=FIPAMessage.Performative.DECLINE,
             )
             dialogue.outgoing_extend([msg])
             msg_bytes = FIPASerializer().encode(msg)
             results.append(
                 Envelope(
-                    to=dialogue.dialogue_label.dialogue_opponent_pbk,
-                    sender=self.crypto.public_key,
+                    to=opponent_pbk,
+                    sender=self._agent_pbk,
                     protocol_id=FIPAMessage.protocol_id,
                     message=msg_bytes,
                 )
             )
-            self.game_instance.stats_manager.add_dialogue_endstate(
+            game_instance.stats_manager.add_dialogue_endstate(
                 EndState.DECLINED_ACCEPT, dialogue.is_self_initiated
             )
         return results
@@ -444,27 +464,34 @@ class FIPABehaviour:
         :param dialogue: the dialogue
         :return: a Transaction
         """
+        game_instance = self._game_instance
+        transaction_manager = game_instance.transaction_manager
+        msg_id = match_accept.get("id")
+        dialogue_id = match_accept.get("dialogue_id")
+        target = match_accept.get("target")
+        dialogue_label = dialogue.dialogue_label
+        opponent_pbk = dialogue_label.dialogue_opponent_pbk
+        acceptances = transaction_manager.pending_initial_acceptances.get(
+            dialogue_label
+        )
         assert (
             match_accept.get("performative") == FIPAMessage.Performative.MATCH_ACCEPT
-            and dialogue.dialogue_label
-            in self.game_instance.transaction_manager.pending_initial_acceptances
-            and match_accept.get("target")
-            in self.game_instance.transaction_manager.pending_initial_acceptances[
-                dialogue.dialogue_label
-            ]
+            and acceptances is not None
+            and target in acceptances
         )
-        logger.debug(
-            "[{}]: on_match_accept: msg_id={}, dialogue_id={}, origin={}, target={}".format(
-                self.agent_name,
-                match_accept.get("id"),
-                match_accept.get("dialogue_id"),
-                dialogue.dialogue_label.dialogue_opponent_pbk,
-                match_accept.get("target"),
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[{}]: on_match_accept: msg_id={}, dialogue_id={}, origin={}, target={}".format(
+                    self.agent_name,
+                    msg_id,
+                    dialogue_id,
+                    opponent_pbk,
+                    target,
+                )
             )
-        )
         results = []
-        transaction = self.game_instance.transaction_manager.pop_pending_initial_acceptance(
-            dialogue.dialogue_label, match_accept.get("target")
+        transaction = transaction_manager.pop_pending_initial_acceptance(
+            dialogue_label, target
         )
         tac_msg = TACMessage(
             tac_type=TACMessage.Type.TRANSACTION,
@@ -478,8 +505,8 @@ class FIPABehaviour:
         tac_bytes = TACSerializer().encode(tac_msg)
         results.append(
             Envelope(
-                to=self.game_instance.controller_pbk,
-                sender=self.crypto.public_key,
+                to=game_instance.controller_pbk,
+                sender=self._agent_pbk,
                 protocol_id=TACMessage.protocol_id,
                 message=tac_bytes,
             )
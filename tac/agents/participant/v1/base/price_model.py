@@ -20,12 +20,37 @@
 
 """A module containing a simple price model."""
 
+import math
+from typing import Dict, List, Tuple
+
 import numpy as np
 
+# the prices of some bandits, with their a and b params.
+Candidates = Tuple[List[float], np.ndarray, np.ndarray]
+# the candidates by constraint on the price and by side of the negotiation.
+CandidatesCache = Dict[Tuple[float, bool], Candidates]
+
+
+def to_tenths(price: float) -> int:
+    """
+    Get the number of tenths nearest to a price, the granularity of the price bandits.
+
+    Unlike round, ties are rounded up. Dividing the result by 10 gives the price of a bandit exactly.
+
+    >>> to_tenths(2.34), to_tenths(-0.26), to_tenths(0.35)
+    (23, -3, 4)
+
+    :param price: the price.
+    :return: the number of tenths.
+    """
+    return math.floor(price * 10.0 + 0.5)
+
 
 class PriceBandit(object):
     """A class for a multi-armed bandit model of price."""
 
+    __slots__ = ("price", "beta_a", "beta_b")
+
     def __init__(self, price: float, beta_a: float = 1.0, beta_b: float = 1.0):
         """
         Instantiate a price bandit object.
@@ -61,11 +86,15 @@ class PriceBandit(object):
 class GoodPriceModel(object):
     """A class for a price model of a good."""
 
+    __slots__ = ("price_bandits", "_candidates")
+
     def __init__(self):
         """Instantiate a good price model."""
         self.price_bandits = dict(
             (price, PriceBandit(price)) for price in [i / 10 for i in range(201)]
         )
+        # the eligible bandits by constraint, cleared on every update.
+        self._candidates = {}  # type: CandidatesCache
 
     def update(self, outcome: bool, price: float) -> None:
         """
@@ -77,6 +106,7 @@ class GoodPriceModel(object):
         """
         bandit = self.price_bandits[price]
         bandit.update(outcome)
+        self._candidates.clear()
 
     def get_price_expectation(self, constraint: float, is_seller: bool) -> float:
         """
@@ -86,15 +116,35 @@ class GoodPriceModel(object):
         :param is_seller: indicating whether the agent is a buyer or seller
         :return: the winning price
         """
-        maxsample = -1
-        winning_price = 20.0
-        for price, bandit in self.price_bandits.items():
-            if (is_seller and price <= constraint) or (
-                not is_seller and price >= constraint
-            ):
-                continue
-            sample = bandit.sample()
-            if sample > maxsample:
-                maxsample = sample
-                winning_price = price
+        candidates = self._candidates.get((constraint, is_seller))
+        if candidates is None:
+            candidates = self._get_candidates(constraint, is_seller)
+            self._candidates[(constraint, is_seller)] = candidates
+        prices, beta_a, beta_b = candidates
+        if len(prices) == 0:
+            return 20.0
+        # sample all the eligible bandits at once, in the same order as one at a time.
+        samples = np.random.beta(beta_a, beta_b)
+        winning_price = prices[int(np.argmax(samples))]
         return winning_price
+
+    def _get_candidates(self, constraint: float, is_seller: bool) -> Candidates:
+        """
+        Get the bandits eligible under a constraint.
+
+        :param constraint: the constraint on the price
+        :param is_seller: indicating whether the agent is a buyer or seller
+        :return: the prices of the eligible bandits, and their a and b params.
+        """
+        bandits = [
+            bandit
+            for price, bandit in self.price_bandits.items()
+            if not (
+                (is_seller and price <= constraint)
+                or (not is_seller and price >= constraint)
+            )
+        ]
+        prices = [bandit.price for bandit in bandits]
+        beta_a = np.array([bandit.beta_a for bandit in bandits], dtype=np.float64)
+        beta_b = np.array([bandit.beta_b for bandit in bandits], dtype=np.float64)
+        return prices, beta_a, beta_b
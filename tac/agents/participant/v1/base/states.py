@@ -26,30 +26,39 @@ This module contains the classes which define the states of an agent.
 - WorldState represent the state of the world from the perspective of the agent.
 """
 
-import copy
 import pprint
 from typing import Dict, List
 
+import numpy as np
+
 from aea.helpers.state.base import AgentState as BaseAgentState
 from aea.helpers.state.base import WorldState as BaseWorldState
 from aea.mail.base import Address
-from tac.agents.participant.v1.base.price_model import GoodPriceModel
-from tac.platform.game.helpers import logarithmic_utility
+from tac.agents.participant.v1.base.price_model import GoodPriceModel, to_tenths
+from tac.platform.game.helpers import apply_transactions, logarithmic_utility
 from tac.platform.game.base import Transaction
 
 Endowment = List[int]  # an element e_j is the endowment of good j.
 UtilityParams = List[float]  # an element u_j is the utility value of good j.
 
+# below this number of transactions, apply updates the state one transaction at a time.
+APPLY_BATCH_MIN_SIZE = 8
+
 
 class AgentState(BaseAgentState):
     """Represent the state of an agent during the game."""
 
+    __slots__ = ("balance", "_utility_params", "_current_holdings")
+
     def __init__(
         self, money: float, endowment: Endowment, utility_params: UtilityParams
     ):
         """
         Instantiate an agent state object.
 
+        The endowment and the utility params are not copied: the caller must not modify them.
+        The holdings are copied on write, the first time the state is updated.
+
         :param money: the money of the agent in this state.
         :param endowment: the endowment for every good.
         :param utility_params: the utility params for every good.
@@ -57,18 +66,19 @@ class AgentState(BaseAgentState):
         BaseAgentState.__init__(self)
         assert len(endowment) == len(utility_params)
         self.balance = money
-        self._utility_params = copy.copy(utility_params)
-        self._current_holdings = copy.copy(endowment)
+        self._utility_params = utility_params
+        self._current_holdings = np.asarray(endowment).view()
+        self._current_holdings.flags.writeable = False
 
     @property
-    def current_holdings(self):
+    def current_holdings(self) -> Endowment:
         """Get current holding of each good."""
-        return copy.copy(self._current_holdings)
+        return self._current_holdings.tolist()
 
     @property
     def utility_params(self) -> UtilityParams:
-        """Get utility parameter for each good."""
-        return copy.copy(self._utility_params)
+        """Get utility parameter for each good. The returned list must not be modified."""
+        return self._utility_params
 
     def get_score(self) -> float:
         """
@@ -108,25 +118,116 @@ class AgentState(BaseAgentState):
             # check if we have the money.
             result = self.balance >= tx.amount + share_of_tx_fee
         else:
-            # check if we have the goods.
-            result = True
-            for good_id, quantity in enumerate(tx.quantities_by_good_pbk.values()):
-                result = result and (self._current_holdings[good_id] >= quantity)
+            # check if we have the goods. the slice is a view, so the holdings are not copied.
+            quantities = tx.quantities_array
+            holdings = self._current_holdings[: len(quantities)]
+            result = bool((holdings >= quantities).all())
         return result
 
     def apply(self, transactions: List[Transaction], tx_fee: float) -> "AgentState":
         """
         Apply a list of transactions to the current state.
 
+        Long sequences of transactions are applied at once, by summing up their changes.
+
         :param transactions: the sequence of transaction.
         :return: the final state.
         """
-        new_state = copy.copy(self)
-        for tx in transactions:
-            new_state.update(tx, tx_fee)
-
+        new_state = self._fast_clone()
+        share_of_tx_fee = round(tx_fee / 2.0, 2)
+        nb_transactions = len(transactions)
+        if nb_transactions < APPLY_BATCH_MIN_SIZE:
+            for tx in transactions:
+                new_state._update(tx, share_of_tx_fee)
+            return new_state
+
+        # the sign is positive for the transactions in which the agent is the buyer.
+        signs = np.empty(nb_transactions, dtype=np.int64)
+        amounts = np.empty(nb_transactions, dtype=np.float64)
+        quantities = np.zeros(
+            (nb_transactions, len(self._current_holdings)), dtype=np.int64
+        )
+        for i, tx in enumerate(transactions):
+            signs[i] = 2 * tx.is_sender_buyer - 1
+            amounts[i] = tx.amount
+            tx_quantities = tx.quantities_array
+            quantities[i, : len(tx_quantities)] = tx_quantities
+
+        new_state.balance, new_state._current_holdings = apply_transactions(
+            new_state.balance,
+            new_state._current_holdings,
+            signs,
+            amounts,
+            quantities,
+            share_of_tx_fee,
+        )
         return new_state
 
+    def apply_many(
+        self, sequences: List[List[Transaction]], tx_fee: float
+    ) -> List["AgentState"]:
+        """
+        Apply several sequences of transactions to the current state.
+
+        The sequences are packed together, padded with empty transactions, and their changes
+        are accumulated in order along the transactions, as apply does for each sequence.
+
+        :param sequences: the sequences of transactions.
+        :param tx_fee: the transaction fee.
+        :return: the final state of each sequence.
+        """
+        if not sequences:
+            return []
+        nb_sequences = len(sequences)
+        nb_transactions = max(len(transactions) for transactions in sequences)
+        nb_goods = len(self._current_holdings)
+        share_of_tx_fee = round(tx_fee / 2.0, 2)
+
+        # the padding transactions have a null sign, so they change neither the balance nor the holdings.
+        signs = np.zeros((nb_sequences, nb_transactions), dtype=np.int64)
+        amounts = np.zeros((nb_sequences, nb_transactions), dtype=np.float64)
+        quantities = np.zeros((nb_sequences, nb_transactions, nb_goods), dtype=np.int64)
+        for k, transactions in enumerate(sequences):
+            for n, tx in enumerate(transactions):
+                signs[k, n] = 2 * tx.is_sender_buyer - 1
+                amounts[k, n] = tx.amount
+                tx_quantities = tx.quantities_array
+                quantities[k, n, : len(tx_quantities)] = tx_quantities
+        lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=nb_sequences)
+        is_transaction = np.arange(nb_transactions) < lengths[:, None]
+
+        # the first column is the starting state; the cumulative sums give every prefix state,
+        # and adding the negated changes in order gives the same floats as update.
+        balances = np.empty((nb_sequences, nb_transactions + 1), dtype=np.float64)
+        balances[:, 0] = self.balance
+        np.negative(
+            signs * amounts + is_transaction * share_of_tx_fee, out=balances[:, 1:]
+        )
+        balances = np.cumsum(balances, axis=1)[:, -1]
+        holdings_changes = signs[:, :, None] * quantities
+        if self._current_holdings.dtype.kind == "f":
+            # the same holds for float holdings, while integer sums do not depend on the order.
+            starting_holdings = np.broadcast_to(
+                self._current_holdings, (nb_sequences, 1, nb_goods)
+            )
+            holdings = np.cumsum(
+                np.concatenate((starting_holdings, holdings_changes), axis=1), axis=1
+            )[:, -1]
+        else:
+            holdings = self._current_holdings + holdings_changes.sum(axis=1)
+        holdings = holdings.astype(self._current_holdings.dtype, copy=False)
+        # the states share the rows of the same array, so they copy them on write.
+        holdings.flags.writeable = False
+
+        new_states = []
+        for balance, current_holdings in zip(balances.tolist(), holdings):
+            new_state = AgentState.__new__(AgentState)
+            new_state.balance = balance
+            new_state._utility_params = self._utility_params
+            new_state._current_holdings = current_holdings
+            new_states.append(new_state)
+        return new_states
+
     def update(self, tx: Transaction, tx_fee: float) -> None:
         """
         Update the agent state from a transaction.
@@ -135,47 +236,109 @@ class AgentState(BaseAgentState):
         :param tx_fee: the transaction fee.
         :return: None
         """
-        share_of_tx_fee = round(tx_fee / 2.0, 2)
-        if tx.is_sender_buyer:
-            diff = tx.amount + share_of_tx_fee
-            self.balance -= diff
+        self._update(tx, round(tx_fee / 2.0, 2))
+
+    def _update(self, tx: Transaction, share_of_tx_fee: float) -> None:
+        """
+        Update the agent state from a transaction, given the share of the transaction fee paid by the agent.
+
+        :param tx: the transaction.
+        :param share_of_tx_fee: the share of the transaction fee.
+        :return: None
+        """
+        # the sign is positive if the agent is the buyer; the share of the fee is paid either way.
+        sign = 2 * tx.is_sender_buyer - 1
+        self.balance -= sign * tx.amount + share_of_tx_fee
+
+        # the share of the fee is paid even if no goods are traded, so only the holdings can be skipped.
+        if tx.total_quantity == 0:
+            return
+        if not self._current_holdings.flags.writeable:
+            self._current_holdings = self._current_holdings.copy()
+        quantities = tx.quantities_array
+        holdings = self._current_holdings
+        # transactions usually list every good, so slicing the holdings is rarely needed.
+        if len(quantities) != len(holdings):
+            holdings = holdings[: len(quantities)]
+        # scaling the quantities by the sign would allocate a temporary array.
+        if sign > 0:
+            holdings += quantities
         else:
-            diff = tx.amount - share_of_tx_fee
-            self.balance += diff
+            holdings -= quantities
+
+    def _fast_clone(self) -> "AgentState":
+        """
+        Copy the object, without going through the constructor.
+
+        The state is known to be consistent already, so only the holdings need to be copied.
 
-        for good_id, quantity in enumerate(tx.quantities_by_good_pbk.values()):
-            quantity_delta = quantity if tx.is_sender_buyer else -quantity
-            self._current_holdings[good_id] += quantity_delta
+        :return: the copy.
+        """
+        new_state = AgentState.__new__(AgentState)
+        new_state.balance = self.balance
+        new_state._utility_params = self._utility_params
+        new_state._current_holdings = self._current_holdings.copy()
+        return new_state
 
     def __copy__(self):
         """Copy the object."""
-        return AgentState(self.balance, self.current_holdings, self.utility_params)
+        return self._fast_clone()
 
     def __str__(self):
         """From object to string."""
+        return "AgentState(money={}, utility_params={}, current_holdings={})".format(
+            self.balance, self.utility_params, self.current_holdings
+        )
+
+    def pretty(self) -> str:
+        """
+        From object to a pretty-printed string, for human-facing output.
+
+        :return: the string.
+        """
         return "AgentState{}".format(
             pprint.pformat(
                 {
                     "money": self.balance,
                     "utility_params": self.utility_params,
-                    "current_holdings": self._current_holdings,
+                    "current_holdings": self.current_holdings,
                 }
             )
         )
 
     def __eq__(self, other) -> bool:
         """Compare equality of two instances of the class."""
+        if self is other:
+            return True
+        # the cheap comparisons come first, and shared params or holdings are not compared element-wise.
         return (
             isinstance(other, AgentState)
             and self.balance == other.balance
-            and self.utility_params == other.utility_params
-            and self._current_holdings == other._current_holdings
+            and (
+                self._utility_params is other._utility_params
+                or self._utility_params == other._utility_params
+            )
+            and (
+                self._current_holdings is other._current_holdings
+                or np.array_equal(self._current_holdings, other._current_holdings)
+            )
         )
 
 
 class WorldState(BaseWorldState):
     """Represent the state of the world from the perspective of the agent."""
 
+    __slots__ = (
+        "_opponent_pbk_to_idx",
+        "_opponent_balances",
+        "_opponent_holdings",
+        "_opponent_utility_params",
+        "_good_pbks",
+        "_good_pbk_to_idx",
+        "_good_price_models",
+        "_opponent_states",
+    )
+
     def __init__(
         self,
         opponent_pbks: List[str],
@@ -191,24 +354,105 @@ class WorldState(BaseWorldState):
         :return: None
         """
         BaseWorldState.__init__(self)
-        self.opponent_states = dict(
-            (
-                agent_pbk,
-                AgentState(
-                    self._expected_initial_money_amount(initial_agent_state.balance),
-                    self._expected_good_endowments(
-                        initial_agent_state.current_holdings
-                    ),
-                    self._expected_utility_params(initial_agent_state.utility_params),
-                ),
-            )
-            for agent_pbk in opponent_pbks
-        )  # type: Dict[str, AgentState]
+        # the expected states of the opponents, as one row per opponent.
+        nb_opponents = len(opponent_pbks)
+        self._opponent_pbk_to_idx = dict(
+            (agent_pbk, idx) for idx, agent_pbk in enumerate(opponent_pbks)
+        )  # type: Dict[str, int]
+        # the expectations do not depend on the opponent, so they are computed once for all of them.
+        self._opponent_balances = np.full(
+            nb_opponents,
+            self._expected_initial_money_amount(initial_agent_state.balance),
+            dtype=np.float64,
+        )
+        # the rows are read-only views of the same expectation: copy the matrix before modifying a row.
+        expected_holdings = np.asarray(
+            self._expected_good_endowments(initial_agent_state.current_holdings)
+        )
+        self._opponent_holdings = np.broadcast_to(
+            expected_holdings, (nb_opponents, len(expected_holdings))
+        )
+        expected_utility_params = np.asarray(
+            self._expected_utility_params(initial_agent_state.utility_params),
+            dtype=np.float64,
+        )
+        self._opponent_utility_params = np.broadcast_to(
+            expected_utility_params, (nb_opponents, len(expected_utility_params))
+        )
 
-        self.good_price_models = dict(
-            (good_pbk, GoodPriceModel()) for good_pbk in good_pbks
+        # the price models are stored by good index, the order of the goods in the transactions.
+        # a model is only created the first time its good is negotiated.
+        self._good_pbks = list(good_pbks)
+        self._good_pbk_to_idx = dict(
+            (good_pbk, idx) for idx, good_pbk in enumerate(good_pbks)
+        )  # type: Dict[str, int]
+        self._good_price_models = {}  # type: Dict[int, GoodPriceModel]
+        # the states built from the rows above, so that their updates are kept.
+        self._opponent_states = {}  # type: Dict[str, AgentState]
+
+    @property
+    def good_price_models(self) -> Dict[str, GoodPriceModel]:
+        """
+        Get the price models created so far.
+
+        The goods that have not been negotiated yet have no model, and getting the models does not create them.
+
+        :return: the price models of the goods negotiated so far, by good public key.
+        """
+        return dict(
+            (self._good_pbks[idx], good_price_model)
+            for idx, good_price_model in self._good_price_models.items()
         )
 
+    def _get_good_price_model(self, good_idx: int) -> GoodPriceModel:
+        """
+        Get the price model of a good, creating it the first time the good is negotiated.
+
+        :param good_idx: the index of the good.
+        :return: the price model of the good.
+        """
+        good_price_model = self._good_price_models.get(good_idx)
+        if good_price_model is None:
+            good_price_model = GoodPriceModel()
+            self._good_price_models[good_idx] = good_price_model
+        return good_price_model
+
+    @property
+    def opponent_states(self) -> Dict[str, AgentState]:
+        """
+        Get the expected state of every opponent.
+
+        The states are built from the expectations the first time they are requested, then cached:
+        the same state objects are returned on each access, so updating them is not lost.
+        The expectations are read-only and never change after the instantiation, so the cache is never invalidated.
+
+        :return: the expected states of the opponents, by public key.
+        """
+        for opponent_pbk in self._opponent_pbk_to_idx.keys():
+            self.get_opponent_state(opponent_pbk)
+        return self._opponent_states
+
+    def get_opponent_state(self, opponent_pbk: str) -> AgentState:
+        """
+        Get the expected state of an opponent.
+
+        The state is cached: see opponent_states.
+
+        :param opponent_pbk: the public key of the opponent.
+        :return: the expected state of the opponent.
+        """
+        opponent_state = self._opponent_states.get(opponent_pbk)
+        if opponent_state is None:
+            idx = self._opponent_pbk_to_idx[opponent_pbk]
+            # the holdings are copied on write, so updating a state leaves the other opponents unchanged.
+            opponent_state = AgentState(
+                self._opponent_balances[idx].item(),
+                self._opponent_holdings[idx],
+                self._opponent_utility_params[idx].tolist(),
+            )
+            self._opponent_states[opponent_pbk] = opponent_state
+        return opponent_state
+
     def update_on_cfp(self, query) -> None:
         """Update the world state when a new cfp is received."""
         pass
@@ -236,14 +480,13 @@ class WorldState(BaseWorldState):
         :param is_accepted: whether the transaction is accepted or not
         :return: None
         """
-        good_pbks = []  # type: List[str]
-        for good_pbk, quantity in transaction.quantities_by_good_pbk.items():
-            if quantity > 0:
-                good_pbks += [good_pbk] * quantity
-        price = transaction.amount
-        price = price / len(good_pbks)
-        for good_pbk in list(set(good_pbks)):
-            self._update_price(good_pbk, price, is_accepted=is_accepted)
+        total_quantity = transaction.total_quantity
+        if total_quantity == 0:
+            return
+        # every good traded is priced the same, so the price is rounded once for all of them.
+        price = to_tenths(transaction.amount / total_quantity) / 10
+        for good_idx in np.flatnonzero(transaction.quantities_array).tolist():
+            self._get_good_price_model(good_idx).update(is_accepted, price)
 
     def update_on_initial_accept(self, transaction: Transaction) -> None:
         """
@@ -304,11 +547,11 @@ class WorldState(BaseWorldState):
         :return: the expected price
         """
         constraint = (
-            round(marginal_utility + share_of_tx_fee, 1)
+            to_tenths(marginal_utility + share_of_tx_fee)
             if is_seller
-            else round(marginal_utility - share_of_tx_fee, 1)
-        )
-        good_price_model = self.good_price_models[good_pbk]
+            else to_tenths(marginal_utility - share_of_tx_fee)
+        ) / 10
+        good_price_model = self._get_good_price_model(self._good_pbk_to_idx[good_pbk])
         expected_price = good_price_model.get_price_expectation(constraint, is_seller)
         return expected_price
 
@@ -321,6 +564,6 @@ class WorldState(BaseWorldState):
         :param is_accepted: boolean indicating the outcome
         :return: None
         """
-        price = round(price, 1)
-        good_price_model = self.good_price_models[good_pbk]
+        price = to_tenths(price) / 10
+        good_price_model = self._get_good_price_model(self._good_pbk_to_idx[good_pbk])
         good_price_model.update(is_accepted, price)
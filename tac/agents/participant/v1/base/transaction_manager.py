@@ -61,10 +61,17 @@ class TransactionManager(object):
 
         self.pending_transaction_timeout = pending_transaction_timeout
 
+        self._locks_version = 0
+
         self._last_update_for_transactions = (
             deque()
         )  # type: Deque[Tuple[datetime.datetime, TRANSACTION_ID]]
 
+    @property
+    def locks_version(self) -> int:
+        """Get the version of the locks, which changes every time a lock is added or removed."""
+        return self._locks_version
+
     def cleanup_pending_transactions(self) -> None:
         """
         Remove all the pending messages (i.e. either proposals or acceptances) that have been stored for an amount of time longer than the timeout.
@@ -91,7 +98,8 @@ class TransactionManager(object):
             )
 
             # remove (safely) the associated pending proposal (if present)
-            self.locked_txs.pop(transaction_id, None)
+            if self.locked_txs.pop(transaction_id, None) is not None:
+                self._locks_version += 1
             self.locked_txs_as_buyer.pop(transaction_id, None)
             self.locked_txs_as_seller.pop(transaction_id, None)
 
@@ -142,11 +150,9 @@ class TransactionManager(object):
 
         :return: the transaction
         """
-        assert (
-            dialogue_label in self.pending_proposals
-            and proposal_id in self.pending_proposals[dialogue_label]
-        )
-        transaction = self.pending_proposals[dialogue_label].pop(proposal_id)
+        proposals = self.pending_proposals.get(dialogue_label)
+        assert proposals is not None and proposal_id in proposals
+        transaction = proposals.pop(proposal_id)
         return transaction
 
     def add_pending_initial_acceptance(
@@ -180,11 +186,9 @@ class TransactionManager(object):
 
         :return: the transaction
         """
-        assert (
-            dialogue_label in self.pending_initial_acceptances
-            and proposal_id in self.pending_initial_acceptances[dialogue_label]
-        )
-        transaction = self.pending_initial_acceptances[dialogue_label].pop(proposal_id)
+        acceptances = self.pending_initial_acceptances.get(dialogue_label)
+        assert acceptances is not None and proposal_id in acceptances
+        transaction = acceptances.pop(proposal_id)
         return transaction
 
     def add_locked_tx(self, transaction: Transaction, as_seller: bool) -> None:
@@ -200,6 +204,7 @@ class TransactionManager(object):
         transaction_id = transaction.transaction_id
         assert transaction_id not in self.locked_txs
         self._register_transaction_with_time(transaction_id)
+        self._locks_version += 1
         self.locked_txs[transaction_id] = transaction
         if as_seller:
             self.locked_txs_as_seller[transaction_id] = transaction
@@ -217,6 +222,7 @@ class TransactionManager(object):
         """
         assert transaction_id in self.locked_txs
         transaction = self.locked_txs.pop(transaction_id)
+        self._locks_version += 1
         self.locked_txs_as_buyer.pop(transaction_id, None)
         self.locked_txs_as_seller.pop(transaction_id, None)
         return transaction
@@ -21,18 +21,16 @@
 """This module contains a base implementation of an agent for TAC."""
 
 import logging
-import time
 from typing import Optional
 
-from aea.agent import Agent
-from aea.channels.oef.connection import OEFMailBox
 from aea.mail.base import Envelope
+from tac.agents.participant.agent import BaseParticipantAgent
 from tac.gui.dashboards.agent import AgentDashboard
 
 logger = logging.getLogger(__name__)
 
 
-class ParticipantAgent(Agent):
+class ParticipantAgent(BaseParticipantAgent):
     """The participant agent class implements a base agent for TAC."""
 
     def __init__(
@@ -42,7 +40,7 @@ class ParticipantAgent(Agent):
         oef_port: int,
         dashboard: Optional[AgentDashboard] = None,
         private_key_pem: Optional[str] = None,
-        agent_timeout: Optional[float] = 1.0,
+        agent_timeout: float = 1.0,
         debug: bool = False,
     ):
         """
@@ -59,7 +57,6 @@ class ParticipantAgent(Agent):
         super().__init__(
             name, oef_addr, oef_port, private_key_pem, agent_timeout, debug=debug
         )
-        self.mailbox = OEFMailBox(self.crypto.public_key, oef_addr, oef_port)
 
     def act(self) -> None:
         """
@@ -83,47 +80,3 @@ class ParticipantAgent(Agent):
             logger.debug("processing message of protocol={}".format(msg.protocol_id))
             handler = self.handlers[msg.protocol_id]
             handler.handle(msg)
-
-    def update(self) -> None:
-        """
-        Update the state of the agent.
-
-        :return: None
-        """
-        self.game_instance.transaction_manager.cleanup_pending_transactions()
-
-    def stop(self) -> None:
-        """
-        Stop the agent.
-
-        :return: None
-        """
-        super().stop()
-        self.game_instance.stop()
-
-    def start(self, rejoin: bool = False) -> None:
-        """
-        Start the agent.
-
-        :return: None
-        """
-        try:
-            self.oef_handler.rejoin = rejoin
-            super().start()
-            self.oef_handler.rejoin = False
-            return
-        except Exception as e:
-            logger.exception(e)
-            logger.debug("Stopping the agent...")
-            self.stop()
-
-        # here only if an error occurred
-        logger.debug("Trying to rejoin in 5 seconds...")
-        time.sleep(5.0)
-        self.start(rejoin=True)
-
-    def setup(self) -> None:
-        """Set up the agent."""
-
-    def teardown(self) -> None:
-        """Tear down the agent."""
@@ -22,7 +22,6 @@
 """Module containing the controller dashboard and related classes."""
 
 import argparse
-import json
 import os
 from typing import Optional, Dict
 
@@ -30,7 +29,7 @@ import numpy as np
 
 from tac.gui.dashboards.base import start_visdom_server, Dashboard
 from tac.agents.controller.base.states import Game
-from tac.platform.game.stats import GameStats
+from tac.platform.game.stats import GameStats, load_game_data
 
 DEFAULT_ENV_NAME = "tac_simulation_env_main"
 
@@ -85,7 +84,7 @@ class ControllerDashboard(Dashboard):
         """
         game_data_json_filepath = os.path.join(datadir, "game.json")
         print("Loading data from {}".format(game_data_json_filepath))
-        game_data = json.load(open(game_data_json_filepath))
+        game_data = load_game_data(game_data_json_filepath)
         game = Game.from_dict(game_data)
         game_stats = GameStats(game)
         return ControllerDashboard(game_stats, env_name=env_name)
@@ -21,7 +21,6 @@
 """Module containing the controller dashboard and related classes."""
 
 import argparse
-import json
 import numpy as np
 import pandas as pd
 import os
@@ -30,7 +29,7 @@ from typing import Optional, Dict, List
 
 from tac.agents.controller.base.states import Game
 from tac.gui.dashboards.base import start_visdom_server, Dashboard
-from tac.platform.game.stats import GameStats
+from tac.platform.game.stats import GameStats, load_game_data
 
 DEFAULT_ENV_NAME = "tac_simulation_env_main"
 
@@ -181,7 +180,7 @@ class LeaderboardDashboard(Dashboard):
             )
             if not os.path.exists(game_data_json_filepath):
                 continue
-            game_data = json.load(open(game_data_json_filepath))
+            game_data = load_game_data(game_data_json_filepath)
             if game_data == {}:
                 print("Found incomplete data for game_dir={}!".format(game_dir))
                 continue
@@ -28,7 +28,7 @@ In particular, it provides REST methods to start/stop a sandbox and an agent, al
 import docker
 import logging
 import os
-import re
+from concurrent.futures import ThreadPoolExecutor
 from queue import Empty
 from threading import Thread
 
@@ -94,10 +94,16 @@ class CustomFlask(Flask):
 def kill_any_running_oef():
     """Kill any running OEF instance."""
     client = docker.from_env()
-    for container in client.containers.list():
-        if any(re.match("fetchai/oef-search", tag) for tag in container.image.tags):
-            logger.debug("Stopping existing OEF Node...")
-            container.stop()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = []
+        for container in client.containers.list():
+            if any(
+                tag.startswith("fetchai/oef-search") for tag in container.image.tags
+            ):
+                logger.debug("Stopping existing OEF Node...")
+                futures.append(executor.submit(container.stop))
+        for future in futures:
+            future.result()
 
 
 def create_app(test_config=None):
@@ -31,7 +31,9 @@ Classes:
 import copy
 from enum import Enum
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
 
 from aea.mail.base import Address
 from aea.protocols.tac.message import TACMessage
@@ -84,8 +86,15 @@ class GameConfiguration:
         self._agent_pbk_to_name = agent_pbk_to_name
         self._good_pbk_to_name = good_pbk_to_name
 
+        self._agent_pbks = list(agent_pbk_to_name.keys())
+        self._agent_names = list(agent_pbk_to_name.values())
+        self._good_pbks = list(good_pbk_to_name.keys())
+        self._good_names = list(good_pbk_to_name.values())
+
         self._check_consistency()
 
+        self._share_of_tx_fee = round(tx_fee / 2.0, 2)
+
     @property
     def version_id(self) -> str:
         """Agent number of a TAC instance."""
@@ -106,6 +115,11 @@ class GameConfiguration:
         """Transaction fee for the TAC instance."""
         return self._tx_fee
 
+    @property
+    def share_of_tx_fee(self) -> float:
+        """Share of the transaction fee paid by each party of a transaction."""
+        return self._share_of_tx_fee
+
     @property
     def agent_pbk_to_name(self) -> Dict[str, str]:
         """Map agent public keys to names."""
@@ -118,23 +132,23 @@ class GameConfiguration:
 
     @property
     def agent_pbks(self) -> List[str]:
-        """List of agent public keys."""
-        return list(self._agent_pbk_to_name.keys())
+        """List of agent public keys. The list is shared and must not be modified."""
+        return self._agent_pbks
 
     @property
-    def agent_names(self):
-        """List of agent names."""
-        return list(self._agent_pbk_to_name.values())
+    def agent_names(self) -> List[str]:
+        """List of agent names. The list is shared and must not be modified."""
+        return self._agent_names
 
     @property
     def good_pbks(self) -> List[str]:
-        """List of good public keys."""
-        return list(self._good_pbk_to_name.keys())
+        """List of good public keys. The list is shared and must not be modified."""
+        return self._good_pbks
 
     @property
     def good_names(self) -> List[str]:
-        """List of good names."""
-        return list(self._good_pbk_to_name.values())
+        """List of good names. The list is shared and must not be modified."""
+        return self._good_names
 
     def _check_consistency(self):
         """
@@ -200,6 +214,8 @@ class GameConfiguration:
 class GoodState:
     """Represent the state of a good during the game."""
 
+    __slots__ = ("price",)
+
     def __init__(self, price: float) -> None:
         """
         Instantiate an agent state object.
@@ -241,6 +257,7 @@ class Transaction:
         :param counterparty: the counterparty of the transaction.
         :param amount: the amount of money involved.
         :param quantities_by_good_pbk: a map from good pbk to the quantity of that good involved in the transaction.
+                                       The goods must be in the same order as in the game configuration.
         :param sender: the sender of the transaction.
 
         :return: None
@@ -251,6 +268,10 @@ class Transaction:
         self.amount = amount
         self.quantities_by_good_pbk = quantities_by_good_pbk
         self._sender = sender
+        self._quantities = tuple(quantities_by_good_pbk.values())
+        self._quantities_array = np.array(self._quantities, dtype=np.int32)
+        self._quantities_array.flags.writeable = False
+        self._total_quantity = sum(self._quantities)
 
         self._check_consistency()
 
@@ -259,6 +280,29 @@ class Transaction:
         """Get the sender public key."""
         return self._sender
 
+    @property
+    def quantities(self) -> Tuple[int, ...]:
+        """
+        Get the quantities of the goods involved in the transaction, as a tuple.
+
+        The i-th element is the quantity of the i-th good in quantities_by_good_pbk.
+        """
+        return self._quantities
+
+    @property
+    def quantities_array(self) -> np.ndarray:
+        """
+        Get the quantities of the goods involved in the transaction, as a read-only array.
+
+        The i-th element is the quantity of the i-th good in quantities_by_good_pbk.
+        """
+        return self._quantities_array
+
+    @property
+    def total_quantity(self) -> int:
+        """Get the total quantity of goods involved in the transaction."""
+        return self._total_quantity
+
     @property
     def buyer_pbk(self) -> Address:
         """Get the publick key of the buyer."""
@@ -283,7 +327,7 @@ class Transaction:
         assert len(self.quantities_by_good_pbk.keys()) == len(
             set(self.quantities_by_good_pbk.keys())
         )
-        assert all(quantity >= 0 for quantity in self.quantities_by_good_pbk.values())
+        assert (self._quantities_array >= 0).all()
 
     def to_dict(self) -> Dict[str, Any]:
         """From object to dictionary."""
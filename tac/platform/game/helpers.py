@@ -26,6 +26,10 @@ from typing import List, Tuple
 import math
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None  # type: ignore
 
 logger = logging.getLogger("tac")
 TAC_SUPPLY_DATAMODEL_NAME = "tac_supply"
@@ -223,6 +227,113 @@ def logarithmic_utility(
     return sum(goodwise_utility)
 
 
+def _logarithmic_utilities(
+    utility_params: np.ndarray, holdings: np.ndarray, quantity_shift: int
+) -> np.ndarray:
+    """Compute the logarithmic utility of every row of the holdings matrix."""
+    return (utility_params * np.log(holdings + quantity_shift)).sum(axis=1)
+
+
+if njit is not None:
+    _logarithmic_utilities = njit(cache=True)(_logarithmic_utilities)
+
+
+def logarithmic_utilities(
+    utility_params: np.ndarray,
+    holdings: np.ndarray,
+    quantity_shift: int = QUANTITY_SHIFT,
+) -> np.ndarray:
+    """
+    Compute the utilities of several agents at once, given their utility function params and good bundles.
+
+    If numba is installed, the computation is compiled the first time it is called.
+    Unlike logarithmic_utility, the shifted quantities are assumed to be strictly positive.
+
+    :param utility_params: the utility function params, a matrix of shape (nb_agents, nb_goods)
+    :param holdings: the good bundles, a matrix of shape (nb_agents, nb_goods)
+    :param quantity_shift: a factor to shift the quantities in the utility function
+    :return: the vector of utility values.
+    """
+    return _logarithmic_utilities(utility_params, holdings, quantity_shift)
+
+
+def _sum_transactions(
+    balance: float,
+    holdings: np.ndarray,
+    signs: np.ndarray,
+    amounts: np.ndarray,
+    quantities: np.ndarray,
+    share_of_tx_fee: float,
+) -> Tuple[float, np.ndarray]:
+    """
+    Apply the transactions to the balance and the holdings at once, keeping the order of their changes.
+
+    This is the fallback when numba is not installed. The balance changes are kept serial on purpose:
+    summing the floats in another order could round differently, and the balance must be bit-exact
+    with applying the transactions one at a time.
+    """
+    # the changes of the balance are floats, so they are subtracted in order, as one at a time.
+    for balance_change in (signs * amounts + share_of_tx_fee).tolist():
+        balance -= balance_change
+    if holdings.dtype.kind == "f":
+        # the same holds for float holdings.
+        holdings[:] = np.cumsum(
+            np.vstack((holdings, signs[:, None] * quantities)), axis=0
+        )[-1]
+    else:
+        holdings += signs @ quantities
+    return balance, holdings
+
+
+def _loop_transactions(
+    balance: float,
+    holdings: np.ndarray,
+    signs: np.ndarray,
+    amounts: np.ndarray,
+    quantities: np.ndarray,
+    share_of_tx_fee: float,
+) -> Tuple[float, np.ndarray]:
+    """Apply the transactions to the balance and the holdings, one at a time."""
+    for i in range(signs.shape[0]):
+        balance -= signs[i] * amounts[i] + share_of_tx_fee
+        holdings += signs[i] * quantities[i]
+    return balance, holdings
+
+
+if njit is not None:
+    _apply_transactions = njit(cache=True)(_loop_transactions)
+else:
+    _apply_transactions = _sum_transactions
+
+
+def apply_transactions(
+    balance: float,
+    holdings: np.ndarray,
+    signs: np.ndarray,
+    amounts: np.ndarray,
+    quantities: np.ndarray,
+    share_of_tx_fee: float,
+) -> Tuple[float, np.ndarray]:
+    """
+    Apply a sequence of transactions to the balance and the holdings of an agent.
+
+    If numba is installed, the transactions are applied one at a time by compiled code.
+    Otherwise, their changes are accumulated in order with numpy. Either way,
+    the result is the same as applying the transactions one at a time.
+
+    :param balance: the balance of the agent.
+    :param holdings: the holdings of the agent, modified in place.
+    :param signs: for every transaction, 1 if the agent is the buyer and -1 if the agent is the seller.
+    :param amounts: the amount of every transaction.
+    :param quantities: the quantities of goods of every transaction, a matrix of shape (nb_transactions, nb_goods)
+    :param share_of_tx_fee: the share of the transaction fee paid by the agent, for every transaction.
+    :return: the new balance and the holdings.
+    """
+    return _apply_transactions(
+        float(balance), holdings, signs, amounts, quantities, share_of_tx_fee
+    )
+
+
 def marginal_utility(
     utility_function_params: List[float],
     current_holdings: List[int],
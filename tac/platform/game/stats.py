@@ -20,12 +20,34 @@
 
 """This module contains a class to query statistics about a game."""
 
+import json
 import numpy as np
 from typing import Any, Dict, List, Tuple
 
 from tac.agents.controller.base.states import Game
 from tac.agents.participant.v1.base.states import AgentState
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def load_game_data(filepath: str) -> Dict[str, Any]:
+    """
+    Load the game data dumped by the controller (i.e. a game.json file).
+
+    If orjson is installed, it is used to parse the file.
+
+    :param filepath: the path to the json file.
+    :return: the game data, as a dictionary.
+    """
+    with open(filepath, "rb") as f:
+        content = f.read()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 class GameStats:
     """A class to query statistics about a game."""
@@ -40,37 +62,59 @@ class GameStats:
         """
         self.game = game
 
+        # the initial state of the replay is only recorded on the first query.
+        self._replayed_game = Game(game.configuration, game.initialization)
+        self._agent_pbks = list(game.configuration.agent_pbks)
+        self._holdings_history = []  # type: List[np.ndarray]
+        self._balance_history = []  # type: List[List[float]]
+        self._score_history = []  # type: List[List[float]]
+        self._price_history = []  # type: List[List[float]]
+
     @classmethod
     def from_json(cls, d: Dict[str, Any]):
         """Read from json."""
         game = Game.from_dict(d)
         return GameStats(game)
 
-    def holdings_history(self):
+    def _replay(self) -> None:
         """
-        Compute the history of holdings.
+        Simulate the game again, and record the state of the game after every transaction.
 
-        :return: a matrix of shape (nb_transactions, nb_agents, nb_goods). i=0 is the initial endowment matrix.
+        The replay is incremental: only the transactions settled since the last call are simulated.
+        This way, all the statistics are computed from a single replay of the game.
+
+        :return: None
         """
-        nb_transactions = len(self.game.transactions)
-        nb_agents = self.game.configuration.nb_agents
-        nb_goods = self.game.configuration.nb_goods
-        result = np.zeros((nb_transactions + 1, nb_agents, nb_goods), dtype=np.int32)
+        if not self._holdings_history:
+            self._record_state()
+
+        nb_replayed_transactions = len(self._replayed_game.transactions)
+        for tx in self.game.transactions[nb_replayed_transactions:]:
+            self._replayed_game.settle_transaction(tx)
+            self._record_state()
 
-        temp_game = Game(self.game.configuration, self.game.initialization)
+    def _record_state(self) -> None:
+        """
+        Record the state of the replayed game.
 
-        # initial holdings
-        result[0, :] = np.asarray(temp_game.initialization.endowments, dtype=np.int32)
+        :return: None
+        """
+        replayed_game = self._replayed_game
+        self._holdings_history.append(
+            np.asarray(replayed_game.get_holdings_matrix(), dtype=np.int32)
+        )
+        self._balance_history.append(list(replayed_game.get_balances().values()))
+        self._score_history.append(list(replayed_game.get_scores().values()))
+        self._price_history.append(replayed_game.get_prices())
 
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            result[idx + 1, :] = np.asarray(
-                temp_game.get_holdings_matrix(), dtype=np.int32
-            )
+    def holdings_history(self):
+        """
+        Compute the history of holdings.
 
-        return result
+        :return: a matrix of shape (nb_transactions, nb_agents, nb_goods). i=0 is the initial endowment matrix.
+        """
+        self._replay()
+        return np.stack(self._holdings_history)
 
     def score_history(self) -> Tuple[List[str], np.ndarray]:
         """
@@ -82,65 +126,25 @@ class GameStats:
         :return: a matrix of shape (nb_transactions + 1, nb_agents), where every row i contains the scores
                  after transaction i (i=0 is a row with the initial scores.)
         """
-        nb_transactions = len(self.game.transactions)
-        nb_agents = self.game.configuration.nb_agents
-        result = np.zeros((nb_transactions + 1, nb_agents))
-
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # initial scores
-        scores_dict = temp_game.get_scores()
-        result[0, :] = list(scores_dict.values())
-        keys = list(scores_dict.keys())
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            scores_dict = temp_game.get_scores()
-            result[idx + 1, :] = list(scores_dict.values())
-
-        return keys, result
+        self._replay()
+        return list(self._agent_pbks), np.asarray(self._score_history, dtype=np.float64)
 
     def balance_history(self) -> Tuple[List[str], np.ndarray]:
         """Get the balance history."""
-        nb_transactions = len(self.game.transactions)
-        nb_agents = self.game.configuration.nb_agents
-        result = np.zeros((nb_transactions + 1, nb_agents), dtype=np.int32)
-
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # initial balances
-        balances_dict = temp_game.get_balances()
-        result[0, :] = np.asarray(list(balances_dict.values()), dtype=np.int32)
-        keys = list(balances_dict.keys())
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            balances_dict = temp_game.get_balances()
-            result[idx + 1, :] = np.asarray(
-                list(balances_dict.values()), dtype=np.int32
-            )
-
-        return keys, result
+        self._replay()
+        return (
+            list(self._agent_pbks),
+            np.asarray(self._balance_history, dtype=np.int32),
+        )
 
     def price_history(self) -> np.ndarray:
         """Get the price history."""
-        nb_transactions = len(self.game.transactions)
-        nb_goods = self.game.configuration.nb_goods
-        result = np.zeros((nb_transactions + 1, nb_goods), dtype=np.float32)
-
-        temp_game = Game(self.game.configuration, self.game.initialization)
+        self._replay()
+        result = np.asarray(self._price_history, dtype=np.float32)
 
         # initial prices
         result[0, :] = np.asarray(0, dtype=np.float32)
 
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            result[idx + 1, :] = np.asarray(temp_game.get_prices(), dtype=np.float32)
-
         return result
 
     def tx_counts(self) -> Dict[str, Dict[str, int]]:
@@ -149,12 +153,7 @@ class GameStats:
         result = {agent_name: 0 for agent_name in agent_pbk_to_name.values()}
         results = {"seller": result.copy(), "buyer": result.copy()}
 
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
+        for tx in self.game.transactions:
             results["seller"][agent_pbk_to_name[tx.seller_pbk]] += 1
             results["buyer"][agent_pbk_to_name[tx.buyer_pbk]] += 1
 
@@ -167,12 +166,7 @@ class GameStats:
             agent_name: [] for agent_name in agent_pbk_to_name.values()
         }  # type: Dict[str, List[float]]
 
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
+        for tx in self.game.transactions:
             results[agent_pbk_to_name[tx.seller_pbk]].append(tx.amount)
 
         return results
@@ -183,27 +177,13 @@ class GameStats:
 
         :return: a matrix of shape (2, nb_goods), where every column i contains the prices of the good.
         """
-        nb_transactions = len(self.game.transactions)
         eq_prices = self.game.initialization.eq_prices
         nb_goods = len(eq_prices)
 
         result = np.zeros((2, nb_goods), dtype=np.float32)
         result[0, :] = np.asarray(eq_prices, dtype=np.float32)
 
-        prices_by_transactions = np.zeros(
-            (nb_transactions + 1, nb_goods), dtype=np.float32
-        )
-
-        # initial prices
-        prices_by_transactions[0, :] = np.asarray(0, dtype=np.float32)
-
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            prices_by_transactions[idx + 1, :] = np.asarray(
-                temp_game.get_prices(), dtype=np.float32
-            )
+        prices_by_transactions = self.price_history()
 
         denominator = (prices_by_transactions != 0).sum(0)
         result[1, :] = np.true_divide(prices_by_transactions.sum(0), denominator)
@@ -231,10 +211,7 @@ class GameStats:
                     self.game.initialization.utility_params[i],
                 ),
             )
-            for agent_pbk, i in zip(
-                self.game.configuration.agent_pbks,
-                range(self.game.configuration.nb_agents),
-            )
+            for i, agent_pbk in enumerate(self.game.configuration.agent_pbks)
         )  # type: Dict[str, AgentState]
 
         result = np.zeros((2, nb_agents), dtype=np.float32)
@@ -242,19 +219,8 @@ class GameStats:
             eq_agent_state.get_score() for eq_agent_state in eq_agent_states.values()
         ]
 
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # initial scores
-        scores_dict = temp_game.get_scores()
-        current_scores[0, :] = list(scores_dict.values())
-        keys = list(scores_dict.keys())
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            scores_dict = temp_game.get_scores()
-            current_scores[0, :] = list(scores_dict.values())
+        keys, score_history = self.score_history()
+        current_scores[0, :] = score_history[-1]
 
         result[1, :] = current_scores[0, :]
         result = np.transpose(result)
@@ -276,10 +242,7 @@ class GameStats:
                     self.game.initialization.utility_params[i],
                 ),
             )
-            for agent_pbk, i in zip(
-                self.game.configuration.agent_pbks,
-                range(self.game.configuration.nb_agents),
-            )
+            for i, agent_pbk in enumerate(self.game.configuration.agent_pbks)
         )  # type: Dict[str, AgentState]
 
         result = {
@@ -296,10 +259,10 @@ class GameStats:
 
         :return: dictionary mapping agent name to initial score.
         """
-        temp_game = Game(self.game.configuration, self.game.initialization)
+        keys, score_history = self.score_history()
         scores_dict = {
             self.game.configuration.agent_pbk_to_name[agent_pbk]: score
-            for agent_pbk, score in temp_game.get_scores().items()
+            for agent_pbk, score in zip(keys, score_history[0])
         }
         return scores_dict
 
@@ -321,10 +284,7 @@ class GameStats:
                     self.game.initialization.utility_params[i],
                 ),
             )
-            for agent_pbk, i in zip(
-                self.game.configuration.agent_pbks,
-                range(self.game.configuration.nb_agents),
-            )
+            for i, agent_pbk in enumerate(self.game.configuration.agent_pbks)
         )  # type: Dict[str, AgentState]
 
         result = np.zeros((1, nb_agents), dtype=np.float32)
@@ -334,22 +294,13 @@ class GameStats:
             eq_agent_state.get_score() for eq_agent_state in eq_agent_states.values()
         ]
 
-        temp_game = Game(self.game.configuration, self.game.initialization)
+        keys, score_history = self.score_history()
 
         # initial scores
         initial_scores = np.zeros((1, nb_agents), dtype=np.float32)
-        scores_dict = temp_game.get_scores()
-        initial_scores[0, :] = list(scores_dict.values())
-        keys = list(scores_dict.keys())
+        initial_scores[0, :] = score_history[0]
         current_scores = np.zeros((1, nb_agents), dtype=np.float32)
-        current_scores[0, :] = initial_scores[0, :]
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            scores_dict = temp_game.get_scores()
-            current_scores[0, :] = list(scores_dict.values())
+        current_scores[0, :] = score_history[-1]
 
         result[0, :] = np.divide(
             np.subtract(current_scores, initial_scores),
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the base class of the TAC agents."""
+import time
+from threading import Thread
+from typing import List
+from unittest.mock import MagicMock, patch
+
+from aea.channels.oef.connection import OEFMailBox
+from aea.mail.base import Envelope
+
+from tac.agents.base import TACAgent
+
+
+class TAgent(TACAgent):
+    """A class to implement a TAC agent for testing."""
+
+    def __init__(self, **kwargs):
+        """Initialize the test agent."""
+        super().__init__("test_agent", **kwargs)
+        self.mailbox = OEFMailBox(self.crypto.public_key, "127.0.0.1", 10000)
+        self.received_at = None
+
+    def setup(self) -> None:
+        """Set up the agent."""
+
+    def teardown(self) -> None:
+        """Tear down the agent."""
+
+    def act(self) -> None:
+        """Perform actions."""
+
+    def react(self) -> None:
+        """React to incoming events."""
+        while not self.inbox.empty():
+            self.inbox.get_nowait()
+            self.received_at = time.monotonic()
+            self.stop()
+
+    def update(self) -> None:
+        """Update the current state of the agent."""
+
+
+def _run_in_thread(test_agent: TAgent) -> Thread:
+    """Start the agent in another thread and wait for it to exit, or for a minute at most."""
+    thread = Thread(target=test_agent.start, daemon=True)
+    thread.start()
+    thread.join(timeout=60.0)
+    return thread
+
+
+def test_main_loop_wakes_up_on_incoming_message():
+    """Test that the main loop reacts to a message without waiting for the whole timeout."""
+    test_agent = TAgent(timeout=3600.0, debug=True)
+    envelope = Envelope(
+        to=test_agent.crypto.public_key,
+        sender="sender",
+        protocol_id="default",
+        message=b"hello",
+    )
+    # the message is sent from another thread once the main loop runs.
+    test_agent.act = MagicMock(
+        side_effect=lambda: Thread(
+            target=test_agent.mailbox._connection.in_queue.put, args=(envelope,)
+        ).start()
+    )
+
+    thread = _run_in_thread(test_agent)
+
+    assert not thread.is_alive()
+    assert test_agent.act.call_count == 1
+    assert test_agent.received_at is not None
+    assert test_agent.agent_state == test_agent.agent_state_computed
+
+
+def test_main_loop_wakes_up_on_stop():
+    """Test that stopping the agent from another thread does not wait for the whole timeout."""
+    test_agent = TAgent(timeout=3600.0, debug=True)
+    # the agent is stopped from another thread once the main loop runs.
+    test_agent.act = MagicMock(
+        side_effect=lambda: Thread(target=test_agent.stop).start()
+    )
+
+    thread = _run_in_thread(test_agent)
+
+    assert not thread.is_alive()
+    assert test_agent.act.call_count == 1
+    assert test_agent.liveness.is_stopped
+
+
+class FakeClock:
+    """A monotonic clock which only moves when the test moves it."""
+
+    def __init__(self):
+        """Initialize the clock."""
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+def _get_wait_timeouts(nb_waits: int, message_waits: List[int]) -> List[float]:
+    """
+    Run the main loop on a fake clock and get the timeouts it waits for the inbox with.
+
+    A wait for which a message arrives returns at once, any other wait lasts its whole timeout.
+
+    :param nb_waits: the number of waits after which the agent is stopped.
+    :param message_waits: the indexes of the waits for which a message arrives.
+    :return: the timeouts of the waits.
+    """
+    test_agent = TAgent(timeout=1.0, max_timeout=4.0, debug=True)
+    test_agent.react = MagicMock()
+    clock = FakeClock()
+    timeouts = []  # type: List[float]
+
+    def wait_for_inbox(timeout: float) -> bool:
+        timeouts.append(timeout)
+        is_message = len(timeouts) - 1 in message_waits
+        if not is_message:
+            clock.now += timeout
+        if len(timeouts) == nb_waits:
+            test_agent.liveness._is_stopped = True
+        return is_message
+
+    test_agent._wait_for_inbox = wait_for_inbox
+    test_agent.liveness._is_stopped = False
+    with patch("tac.agents.base.time", clock):
+        test_agent._run_main_loop()
+    return timeouts
+
+
+def test_main_loop_backs_off_when_idle():
+    """Test that the cadence of the main loop doubles at every idle cycle, up to the maximum timeout."""
+    assert _get_wait_timeouts(6, []) == [1.0, 2.0, 4.0, 4.0, 4.0, 4.0]
+
+
+def test_main_loop_resets_the_backoff_on_incoming_message():
+    """Test that the cadence of the main loop falls back to the timeout when a message arrives."""
+    assert _get_wait_timeouts(8, [3]) == [1.0, 2.0, 4.0, 4.0, 1.0, 1.0, 2.0, 4.0]
+
+
+def test_main_loop_polls_the_inbox_when_it_cannot_wait_on_it():
+    """Test that the main loop still reacts to a message when the queue of the inbox is not available."""
+    test_agent = TAgent(timeout=3600.0, debug=True)
+    envelope = Envelope(
+        to=test_agent.crypto.public_key,
+        sender="sender",
+        protocol_id="default",
+        message=b"hello",
+    )
+    test_agent.act = MagicMock(
+        side_effect=lambda: Thread(
+            target=test_agent.mailbox._connection.in_queue.put, args=(envelope,)
+        ).start()
+    )
+
+    with patch("tac.agents.base._get_inbox_queue", return_value=None):
+        thread = _run_in_thread(test_agent)
+
+    assert not thread.is_alive()
+    assert test_agent.received_at is not None
+    assert test_agent.liveness.is_stopped
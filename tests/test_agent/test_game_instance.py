@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the game instance of the participant agents."""
+import random
+import time
+from collections import Counter
+from typing import List
+
+from aea.channels.oef.connection import MailStats
+from aea.protocols.oef.models import Description
+
+from tac.agents.participant.v1.base.game_instance import GameInstance
+from tac.agents.participant.v1.base.helpers import (
+    build_dict,
+    get_goods_quantities_description,
+)
+from tac.agents.participant.v1.examples.strategy import BaselineStrategy
+from tac.platform.game.base import GameData, Transaction
+
+AGENT_PBK = "agent_pbk"
+GOOD_PBKS = ["good_pbk_0", "good_pbk_1", "good_pbk_2"]
+TX_FEE = 1.0
+
+
+def _make_game_instance() -> GameInstance:
+    """Make a game instance initialized with the data of a small game."""
+    game_instance = GameInstance("agent", BaselineStrategy(), MailStats(), "v1")
+    game_data = GameData(
+        sender="controller_pbk",
+        money=100,
+        endowment=[4, 5, 6],
+        utility_params=[20.0, 30.0, 50.0],
+        nb_agents=2,
+        nb_goods=3,
+        tx_fee=TX_FEE,
+        agent_pbk_to_name={AGENT_PBK: "agent", "opponent_pbk": "opponent"},
+        good_pbk_to_name={
+            good_pbk: "good_{}".format(i) for i, good_pbk in enumerate(GOOD_PBKS)
+        },
+        version_id="v1",
+    )
+    game_instance.init(game_data, AGENT_PBK)
+    return game_instance
+
+
+def _make_sale(transaction_id: str, quantities: list) -> Transaction:
+    """Make a transaction in which the agent sells the given quantities."""
+    return Transaction(
+        transaction_id,
+        False,
+        "opponent_pbk",
+        10,
+        dict(zip(GOOD_PBKS, quantities)),
+        AGENT_PBK,
+    )
+
+
+def _get_proposal_values(game_instance: GameInstance, is_seller: bool) -> list:
+    """Get the values of the candidate proposals of the game instance."""
+    return [
+        proposal.values
+        for proposal in game_instance._get_candidate_proposals(is_seller)
+    ]
+
+
+def test_cache_is_invalidated_when_the_locks_change():
+    """Test that the state after locks and the candidate proposals follow the locks."""
+    game_instance = _make_game_instance()
+    initial_holdings = game_instance.state_after_locks(is_seller=True).current_holdings
+    initial_proposals = _get_proposal_values(game_instance, is_seller=True)
+    locked_holdings = [3, 3, 3]
+
+    game_instance.transaction_manager.add_locked_tx(
+        _make_sale("tx_0", [1, 2, 3]), as_seller=True
+    )
+    assert (
+        game_instance.state_after_locks(is_seller=True).current_holdings
+        == locked_holdings
+    )
+    locked_proposals = _get_proposal_values(game_instance, is_seller=True)
+    assert locked_proposals != initial_proposals
+
+    game_instance.transaction_manager.pop_locked_tx("tx_0")
+    assert (
+        game_instance.state_after_locks(is_seller=True).current_holdings
+        == initial_holdings
+    )
+    assert _get_proposal_values(game_instance, is_seller=True) == initial_proposals
+
+    game_instance.transaction_manager.add_locked_tx(
+        _make_sale("tx_1", [1, 2, 3]), as_seller=True
+    )
+    assert (
+        game_instance.state_after_locks(is_seller=True).current_holdings
+        == locked_holdings
+    )
+    assert _get_proposal_values(game_instance, is_seller=True) == locked_proposals
+
+    game_instance.transaction_manager.pending_transaction_timeout = 0
+    time.sleep(0.01)
+    game_instance.transaction_manager.cleanup_pending_transactions()
+    assert (
+        game_instance.state_after_locks(is_seller=True).current_holdings
+        == initial_holdings
+    )
+    assert _get_proposal_values(game_instance, is_seller=True) == initial_proposals
+
+
+def test_score_diff_upper_bound_does_not_reject_profitable_transactions():
+    """Test that the early-reject bound is never below the exact score difference."""
+    random.seed(0)
+    game_instance = _make_game_instance()
+    game_instance.transaction_manager.add_locked_tx(
+        _make_sale("locked_sale", [1, 0, 2]), as_seller=True
+    )
+    game_instance.transaction_manager.add_locked_tx(
+        Transaction(
+            "locked_purchase",
+            True,
+            "opponent_pbk",
+            10,
+            dict(zip(GOOD_PBKS, [0, 1, 0])),
+            AGENT_PBK,
+        ),
+        as_seller=False,
+    )
+    share_of_tx_fee = game_instance.game_configuration.share_of_tx_fee
+    for i in range(200):
+        is_seller = random.random() < 0.5
+        transaction = Transaction(
+            "tx_{}".format(i),
+            not is_seller,
+            "opponent_pbk",
+            random.randint(0, 50),
+            dict(zip(GOOD_PBKS, [random.randint(0, 3) for _ in GOOD_PBKS])),
+            AGENT_PBK,
+        )
+        upper_bound = game_instance._get_score_diff_upper_bound(
+            transaction, share_of_tx_fee
+        )
+        for state in (
+            game_instance.agent_state,
+            game_instance.state_after_locks(is_seller),
+        ):
+            if not state.check_transaction_is_consistent(transaction, TX_FEE):
+                continue
+            score_diff = state.get_score_diff_from_transaction(transaction, TX_FEE)
+            assert score_diff <= upper_bound + 1e-9
+
+
+def _make_proposal(
+    good_pbks: List[str], quantities: List[int], price: float
+) -> Description:
+    """Make the proposal of a seller."""
+    proposal = get_goods_quantities_description(good_pbks, quantities, is_supply=True)
+    proposal.values["price"] = price
+    return proposal
+
+
+def _get_generated_proposals(
+    candidate_proposals: List[Description], nb_proposals: int
+) -> List[Description]:
+    """Generate proposals as a seller, to a buyer of the goods, from the given candidates."""
+    random.seed(0)
+    game_instance = _make_game_instance()
+    game_instance._get_candidate_proposals = lambda is_seller: candidate_proposals
+    cfp_services = build_dict(set(GOOD_PBKS), is_supply=False)
+    return [
+        game_instance.generate_proposal(cfp_services, is_seller=True)
+        for _ in range(nb_proposals)
+    ]
+
+
+def test_generate_proposal_picks_uniformly_among_the_matching_proposals():
+    """Test that the proposal is drawn uniformly among the proposals which match the cfp and have a positive price."""
+    ineligible_proposals = [
+        _make_proposal(GOOD_PBKS, [1, 0, 0], 0.0),
+        _make_proposal(["other_good_pbk"], [1], 10.0),
+    ]
+    eligible_proposals = [
+        _make_proposal(GOOD_PBKS, [1, 0, 0], 10.0),
+        _make_proposal(GOOD_PBKS, [0, 1, 0], 20.0),
+        _make_proposal(GOOD_PBKS, [0, 0, 1], 30.0),
+    ]
+
+    assert _get_generated_proposals([], 10) == [None] * 10
+    assert _get_generated_proposals(ineligible_proposals, 10) == [None] * 10
+
+    proposals = _get_generated_proposals(
+        ineligible_proposals + eligible_proposals[:1], 10
+    )
+    assert all(proposal is eligible_proposals[0] for proposal in proposals)
+
+    nb_proposals = 6000
+    proposals = _get_generated_proposals(
+        [
+            ineligible_proposals[0],
+            eligible_proposals[0],
+            ineligible_proposals[1],
+            eligible_proposals[1],
+            eligible_proposals[2],
+        ],
+        nb_proposals,
+    )
+    counts = Counter(id(proposal) for proposal in proposals)
+    assert set(counts.keys()) == set(id(proposal) for proposal in eligible_proposals)
+    expected_count = nb_proposals / len(eligible_proposals)
+    for count in counts.values():
+        assert abs(count - expected_count) < 0.05 * expected_count
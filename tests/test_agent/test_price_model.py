@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the price model of the participant agents."""
+import math
+import random
+
+import numpy as np
+
+from tac.agents.participant.v1.base.price_model import GoodPriceModel, to_tenths
+
+
+def _get_price_expectation_one_at_a_time(
+    good_price_model: GoodPriceModel, constraint: float, is_seller: bool
+) -> float:
+    """Get the price expectation by sampling the eligible bandits one at a time."""
+    maxsample = -1
+    winning_price = 20.0
+    for price, bandit in good_price_model.price_bandits.items():
+        if (is_seller and price <= constraint) or (
+            not is_seller and price >= constraint
+        ):
+            continue
+        sample = bandit.sample()
+        if sample > maxsample:
+            maxsample = sample
+            winning_price = price
+    return winning_price
+
+
+def _update_randomly(good_price_model: GoodPriceModel, nb_updates: int) -> None:
+    """Update the price model with random outcomes at random prices."""
+    for _ in range(nb_updates):
+        good_price_model.update(random.random() < 0.5, random.randint(0, 200) / 10)
+
+
+def test_update_clears_the_candidates():
+    """Test that updating the model invalidates the cached eligible bandits."""
+    good_price_model = GoodPriceModel()
+    good_price_model.get_price_expectation(10.0, True)
+    good_price_model.get_price_expectation(10.0, False)
+    assert len(good_price_model._candidates) == 2
+
+    good_price_model.update(True, 15.0)
+
+    assert good_price_model._candidates == {}
+    good_price_model.get_price_expectation(10.0, True)
+    _, beta_a, beta_b = good_price_model._candidates[(10.0, True)]
+    prices = [i / 10 for i in range(101, 201)]
+    assert beta_a.tolist() == [2.0 if price == 15.0 else 1.0 for price in prices]
+    assert beta_b.tolist() == [1.0] * len(prices)
+
+
+def test_price_expectation_matches_sampling_one_at_a_time():
+    """Test that sampling the eligible bandits at once picks the same price as one at a time, for a given seed."""
+    random.seed(0)
+    good_price_model = GoodPriceModel()
+    for step in range(200):
+        _update_randomly(good_price_model, random.randint(0, 3))
+        constraint = random.randint(-10, 210) / 10
+        is_seller = random.random() < 0.5
+
+        np.random.seed(step)
+        expected_price = _get_price_expectation_one_at_a_time(
+            good_price_model, constraint, is_seller
+        )
+        np.random.seed(step)
+        price = good_price_model.get_price_expectation(constraint, is_seller)
+
+        assert price == expected_price
+
+
+def test_to_tenths_maps_the_bandit_prices_to_themselves():
+    """Test that the price of every bandit, and its opposite, is its own key."""
+    price_bandits = GoodPriceModel().price_bandits
+    for i in range(201):
+        price = i / 10
+        assert to_tenths(price) / 10 == price
+        assert to_tenths(price) / 10 in price_bandits
+        assert to_tenths(-price) / 10 == -price
+
+
+def test_to_tenths_matches_round_away_from_ties():
+    """Test that the bandit keys are those of round, for positive and negative prices which are not ties."""
+    random.seed(0)
+    for _ in range(10000):
+        price = random.uniform(-20.0, 20.0)
+        if abs(price * 10.0 - math.floor(price * 10.0) - 0.5) < 1e-6:
+            continue
+        assert to_tenths(price) / 10 == round(price, 1)
+
+
+def test_to_tenths_rounds_ties_up():
+    """Test that the prices halfway between two bandits go to the upper one, when round goes to either one."""
+    for k in range(-200, 200):
+        price = (2 * k + 1) / 20
+        assert to_tenths(price) == k + 1
+        assert round(price, 1) in (k / 10, (k + 1) / 10)
+        # the prices just around the tie go to the nearest bandit, as with round.
+        assert to_tenths(price - 1e-9) / 10 == round(price - 1e-9, 1) == k / 10
+        assert to_tenths(price + 1e-9) / 10 == round(price + 1e-9, 1) == (k + 1) / 10
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the states of the participant agents."""
+import random
+from typing import List
+
+import numpy as np
+import pytest
+
+from tac.agents.participant.v1.base.states import (
+    APPLY_BATCH_MIN_SIZE,
+    AgentState,
+    WorldState,
+)
+from tac.platform.game.base import Transaction
+from tac.platform.game.helpers import (
+    _loop_transactions,
+    _sum_transactions,
+    apply_transactions,
+)
+
+GOOD_PBKS = ["good_pbk_{}".format(i) for i in range(5)]
+TX_FEE = 0.3
+
+
+def _make_transactions(nb_transactions: int) -> List[Transaction]:
+    """Make a sequence of random transactions."""
+    return [
+        Transaction(
+            "tx_{}".format(i),
+            random.random() < 0.5,
+            "counterparty_pbk",
+            round(random.uniform(0.0, 20.0), 2),
+            dict(zip(GOOD_PBKS, [random.randint(0, 3) for _ in GOOD_PBKS])),
+            "agent_pbk",
+        )
+        for i in range(nb_transactions)
+    ]
+
+
+def test_batched_apply_matches_update():
+    """Test that applying a long sequence of transactions at once gives the same state as updating one at a time."""
+    random.seed(0)
+    for _ in range(100):
+        agent_state = AgentState(
+            round(random.uniform(0.0, 1000.0), 2),
+            [random.randint(0, 50) for _ in GOOD_PBKS],
+            [random.uniform(1.0, 50.0) for _ in GOOD_PBKS],
+        )
+        transactions = _make_transactions(
+            random.randint(APPLY_BATCH_MIN_SIZE, 4 * APPLY_BATCH_MIN_SIZE)
+        )
+
+        expected_state = agent_state.apply([], TX_FEE)
+        for tx in transactions:
+            expected_state.update(tx, TX_FEE)
+
+        assert agent_state.apply(transactions, TX_FEE) == expected_state
+
+
+@pytest.mark.parametrize(
+    "implementation", [_sum_transactions, _loop_transactions, apply_transactions]
+)
+def test_apply_transactions_matches_update(implementation):
+    """Test that every implementation of apply_transactions gives the same result as updating one at a time."""
+    random.seed(0)
+    for _ in range(100):
+        agent_state = AgentState(
+            round(random.uniform(0.0, 1000.0), 2),
+            [random.randint(0, 50) for _ in GOOD_PBKS],
+            [random.uniform(1.0, 50.0) for _ in GOOD_PBKS],
+        )
+        transactions = _make_transactions(random.randint(1, 4 * APPLY_BATCH_MIN_SIZE))
+
+        expected_state = agent_state.apply([], TX_FEE)
+        for tx in transactions:
+            expected_state.update(tx, TX_FEE)
+
+        signs = np.array(
+            [2 * tx.is_sender_buyer - 1 for tx in transactions], dtype=np.int64
+        )
+        amounts = np.array([tx.amount for tx in transactions], dtype=np.float64)
+        quantities = np.array([tx.quantities for tx in transactions], dtype=np.int64)
+        balance, holdings = implementation(
+            agent_state.balance,
+            np.array(agent_state.current_holdings),
+            signs,
+            amounts,
+            quantities,
+            round(TX_FEE / 2.0, 2),
+        )
+
+        assert balance == expected_state.balance
+        assert holdings.tolist() == expected_state.current_holdings
+
+
+def test_states_do_not_modify_shared_holdings():
+    """Test that updating states built from the same holdings leaves the source and the sibling states unchanged."""
+    random.seed(0)
+    endowment = np.array([5, 6, 7, 8, 9])
+    utility_params = [20.0, 20.0, 20.0, 20.0, 20.0]
+    agent_state = AgentState(100.0, endowment, utility_params)
+    sibling_state = AgentState(100.0, endowment, utility_params)
+
+    agent_state.update(_make_transactions(1)[0], TX_FEE)
+    new_state = sibling_state.apply(_make_transactions(APPLY_BATCH_MIN_SIZE), TX_FEE)
+    new_state.update(_make_transactions(1)[0], TX_FEE)
+
+    assert endowment.tolist() == [5, 6, 7, 8, 9]
+    assert sibling_state.current_holdings == [5, 6, 7, 8, 9]
+
+    world_state = WorldState(
+        ["opponent_pbk_0", "opponent_pbk_1"], GOOD_PBKS, sibling_state
+    )
+    expected_holdings = world_state.get_opponent_state(
+        "opponent_pbk_0"
+    ).current_holdings
+    opponent_state = world_state.get_opponent_state("opponent_pbk_0")
+    sibling_opponent_state = world_state.get_opponent_state("opponent_pbk_1")
+
+    opponent_state.update(_make_transactions(1)[0], TX_FEE)
+    opponent_state.apply(_make_transactions(APPLY_BATCH_MIN_SIZE), TX_FEE).update(
+        _make_transactions(1)[0], TX_FEE
+    )
+    sibling_opponent_state.apply(_make_transactions(1), TX_FEE)
+
+    assert opponent_state.current_holdings != expected_holdings
+    assert sibling_opponent_state.current_holdings == expected_holdings
+    assert (
+        world_state.get_opponent_state("opponent_pbk_1").current_holdings
+        == expected_holdings
+    )
+
+
+def test_opponent_states_keep_their_updates():
+    """Test that the opponent states are cached, so that updating them is not lost."""
+    random.seed(0)
+    agent_state = AgentState(100.0, [5, 6, 7, 8, 9], [20.0] * len(GOOD_PBKS))
+    world_state = WorldState(
+        ["opponent_pbk_0", "opponent_pbk_1"], GOOD_PBKS, agent_state
+    )
+    opponent_state = world_state.get_opponent_state("opponent_pbk_0")
+    tx = _make_transactions(1)[0]
+
+    world_state.opponent_states["opponent_pbk_0"].update(tx, TX_FEE)
+
+    assert world_state.opponent_states["opponent_pbk_0"] is opponent_state
+    assert world_state.get_opponent_state("opponent_pbk_0") == agent_state.apply(
+        [tx], TX_FEE
+    )
+    assert world_state.opponent_states["opponent_pbk_1"] == agent_state
+
+
+def test_apply_many_matches_apply():
+    """Test that applying several sequences at once gives the same states as applying each of them."""
+    random.seed(0)
+    for _ in range(50):
+        agent_state = AgentState(
+            round(random.uniform(0.0, 1000.0), 2),
+            [random.randint(0, 50) for _ in GOOD_PBKS],
+            [random.uniform(1.0, 50.0) for _ in GOOD_PBKS],
+        )
+        sequences = [
+            _make_transactions(random.randint(0, 4 * APPLY_BATCH_MIN_SIZE))
+            for _ in range(random.randint(1, 10))
+        ]
+
+        new_states = agent_state.apply_many(sequences, TX_FEE)
+
+        assert len(new_states) == len(sequences)
+        for new_state, transactions in zip(new_states, sequences):
+            assert new_state == agent_state.apply(transactions, TX_FEE)
+
+    assert agent_state.apply_many([], TX_FEE) == []
+
+
+def test_apply_many_states_do_not_share_holdings():
+    """Test that updating a state returned by apply_many leaves the other states unchanged."""
+    random.seed(0)
+    agent_state = AgentState(100.0, [5, 6, 7, 8, 9], [20.0] * len(GOOD_PBKS))
+    sequences = [_make_transactions(3), _make_transactions(3)]
+    new_states = agent_state.apply_many(sequences, TX_FEE)
+    expected_holdings = new_states[1].current_holdings
+
+    new_states[0].update(_make_transactions(1)[0], TX_FEE)
+
+    assert new_states[1].current_holdings == expected_holdings
+    assert new_states[1] == agent_state.apply(sequences[1], TX_FEE)
+
+
+def test_price_models_are_created_on_first_use():
+    """Test that getting the price models does not create them, and that negotiating a good does."""
+    agent_state = AgentState(100.0, [5, 6, 7, 8, 9], [20.0] * len(GOOD_PBKS))
+    world_state = WorldState(["opponent_pbk"], GOOD_PBKS, agent_state)
+    assert world_state.good_price_models == {}
+    assert world_state.good_price_models == {}
+
+    world_state.expected_price(GOOD_PBKS[1], 10.0, True, TX_FEE / 2)
+    world_state.update_on_declined_propose(
+        Transaction(
+            "tx",
+            True,
+            "opponent_pbk",
+            10.0,
+            dict(zip(GOOD_PBKS, [0, 0, 2, 0, 1])),
+            "agent_pbk",
+        )
+    )
+
+    good_price_models = world_state.good_price_models
+    assert sorted(good_price_models.keys()) == [
+        GOOD_PBKS[1],
+        GOOD_PBKS[2],
+        GOOD_PBKS[4],
+    ]
+    assert (
+        good_price_models[GOOD_PBKS[1]] is world_state.good_price_models[GOOD_PBKS[1]]
+    )
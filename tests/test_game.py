@@ -426,6 +426,70 @@ class TestGame:
 
         assert not game.is_transaction_valid(invalid_transaction)
 
+    def test_transaction_invalid_if_quantities_exceed_the_goods(self):
+        """Test that a transaction is invalid if it gives more quantities than there are goods."""
+        nb_agents = 3
+        nb_goods = 3
+        tx_fee = 1.0
+        agent_pbk_to_name = {
+            "tac_agent_0_pbk": "tac_agent_0",
+            "tac_agent_1_pbk": "tac_agent_1",
+            "tac_agent_2_pbk": "tac_agent_2",
+        }
+        good_pbk_to_name = {
+            "tac_good_0_pbk": "tac_good_0",
+            "tac_good_1_pbk": "tac_good_1",
+            "tac_good_2_pbk": "tac_good_2",
+        }
+        money_amounts = [20, 20, 20]
+        endowments = [[1, 1, 1], [2, 1, 1], [1, 1, 2]]
+        utility_params = [[20.0, 40.0, 40.0], [10.0, 50.0, 40.0], [40.0, 30.0, 30.0]]
+        eq_prices = [1.0, 1.0, 4.0]
+        eq_good_holdings = [[1.0, 1.0, 4.0], [1.0, 5.0, 1.0], [6.0, 1.0, 2.0]]
+        eq_money_holdings = [20.0, 20.0, 20.0]
+
+        game_configuration = GameConfiguration(
+            "1", nb_agents, nb_goods, tx_fee, agent_pbk_to_name, good_pbk_to_name
+        )
+        game_initialization = GameInitialization(
+            money_amounts,
+            endowments,
+            utility_params,
+            eq_prices,
+            eq_good_holdings,
+            eq_money_holdings,
+        )
+
+        game = Game(game_configuration, game_initialization)
+
+        tx_id = "some_tx_id"
+        sender_pbk = "tac_agent_0_pbk"
+        is_sender_buyer = True
+        counterparty_pbk = "tac_agent_1_pbk"
+        amount = 10
+        quantities_by_good = {0: 1, 1: 0, 2: 0, 3: 0}
+        invalid_transaction = Transaction(
+            tx_id,
+            is_sender_buyer,
+            counterparty_pbk,
+            amount,
+            quantities_by_good,
+            sender_pbk,
+        )
+
+        assert not game.is_transaction_valid(invalid_transaction)
+
+        for quantities_by_good in [{0: 1}, {0: 1, 1: 0, 2: 0}]:
+            valid_transaction = Transaction(
+                tx_id,
+                is_sender_buyer,
+                counterparty_pbk,
+                amount,
+                quantities_by_good,
+                sender_pbk,
+            )
+            assert game.is_transaction_valid(valid_transaction)
+
     def test_generate_game(self):
         """Test the game generation algorithm."""
         version_id = "1"
@@ -623,6 +687,87 @@ class TestGame:
 
         assert actual_game == expected_game
 
+    def test_replay(self):
+        """Test that replaying transactions is equivalent to settling them one at a time."""
+        version_id = "1"
+        nb_agents = 3
+        nb_goods = 3
+        tx_fee = 1.0
+        agent_pbk_to_name = {
+            "tac_agent_0_pbk": "tac_agent_0",
+            "tac_agent_1_pbk": "tac_agent_1",
+            "tac_agent_2_pbk": "tac_agent_2",
+        }
+        good_pbk_to_name = {
+            "tac_good_0_pbk": "tac_good_0",
+            "tac_good_1_pbk": "tac_good_1",
+            "tac_good_2_pbk": "tac_good_2",
+        }
+        money_amounts = [20.0, 20.0, 20.0]
+        endowments = [[1, 1, 1], [2, 1, 1], [1, 1, 2]]
+        utility_params = [[20.0, 40.0, 40.0], [10.0, 50.0, 40.0], [40.0, 30.0, 30.0]]
+        eq_prices = [1.0, 1.0, 4.0]
+        eq_good_holdings = [[1.0, 1.0, 4.0], [1.0, 5.0, 1.0], [6.0, 1.0, 2.0]]
+        eq_money_holdings = [20.0, 20.0, 20.0]
+
+        game_configuration = GameConfiguration(
+            version_id, nb_agents, nb_goods, tx_fee, agent_pbk_to_name, good_pbk_to_name
+        )
+        game_initialization = GameInitialization(
+            money_amounts,
+            endowments,
+            utility_params,
+            eq_prices,
+            eq_good_holdings,
+            eq_money_holdings,
+        )
+
+        transactions = [
+            Transaction(
+                "tx_1",
+                True,
+                "tac_agent_1_pbk",
+                10.0,
+                {0: 2, 1: 0, 2: 0},
+                "tac_agent_0_pbk",
+            ),
+            Transaction(
+                "tx_2",
+                True,
+                "tac_agent_0_pbk",
+                5.0,
+                {0: 2, 1: 1, 2: 0},
+                "tac_agent_2_pbk",
+            ),
+            Transaction(
+                "tx_3",
+                False,
+                "tac_agent_1_pbk",
+                2.0,
+                {0: 0, 1: 0, 2: 1},
+                "tac_agent_2_pbk",
+            ),
+        ]
+
+        expected_game = Game(game_configuration, game_initialization)
+        for transaction in transactions:
+            expected_game.settle_transaction(transaction)
+
+        actual_game = Game(game_configuration, game_initialization)
+        actual_game.replay(transactions)
+
+        assert actual_game == expected_game
+        assert actual_game.get_holdings_matrix() == expected_game.get_holdings_matrix()
+        assert actual_game.get_balances() == expected_game.get_balances()
+        assert actual_game.get_prices() == expected_game.get_prices()
+
+        # the seller does not have the goods anymore.
+        invalid_transaction = Transaction(
+            "tx_4", True, "tac_agent_1_pbk", 1.0, {0: 1, 1: 0, 2: 0}, "tac_agent_2_pbk"
+        )
+        with pytest.raises(AssertionError):
+            actual_game.replay([invalid_transaction])
+
 
 class TestGoodState:
     """Class to test the good state class."""